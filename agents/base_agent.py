@@ -1,41 +1,243 @@
 """Base Agent class with common functionality."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Type, TypeVar
+import functools
+import hashlib
 import json
+import sys
+import re
 from pathlib import Path
 import logging
 
-from utils.llm_client import LLMClient
+import orjson
+from pydantic import BaseModel, ValidationError
+
+from utils.llm_client import LLMClient, get_default_client
+from utils.llm_cache import LLMCache
 from utils.logger import StructuredLogger
+from utils.validators import construct_trusted
 
 logger = logging.getLogger(__name__)
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# JSON object inside a ```json (or bare ```) fence
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
+
+def _digest(obj: Any) -> Dict[str, Any]:
+    """Summarize a large payload for logging without copying it.
+    
+    Returns a blake2b hash of its canonical JSON, its serialized size and
+    its top-level key (or item) count.
+    """
+    raw = orjson.dumps(
+        obj,
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    )
+    return {
+        "blake2b": hashlib.blake2b(raw, digest_size=16).hexdigest(),
+        "bytes": len(raw),
+        "keys": len(obj) if isinstance(obj, (dict, list)) else None
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _stable_prompt(prompt: str) -> str:
+    """Normalize a prompt so every call sends byte-identical text.
+    
+    Providers reuse cached prompt prefixes only on an exact match, so
+    trailing whitespace and line-ending differences are removed once here.
+    The result is interned and memoized, so every agent built from the
+    same system prompt shares one string object.
+    """
+    return sys.intern("\n".join(line.rstrip() for line in prompt.strip().splitlines()))
+
+
+# Characters that change JSON nesting or string state
+_JSON_STRUCT_RE = re.compile(r'[{}\[\]"\\]')
+
+
+class _StreamItemParser:
+    """Cuts complete list items out of a streamed JSON object.
+    
+    Tracks object/list nesting (ignoring brackets inside strings) across
+    chunks and returns the text of every object that is a direct element
+    of one top-level list field, such as "hypotheses_generated". Objects
+    anywhere else in the response (other lists, nested objects) are
+    skipped.
+    """
+    
+    def __init__(self, list_key: str):
+        self.list_key = list_key
+        self._stack = []
+        self._in_string = False
+        self._escaped_at = -1
+        self._offset = 0
+        self._in_list = False
+        self._parts = None
+        self._key_parts = None
+        self._last_key = None
+    
+    def feed(self, delta: str) -> list:
+        """Consume the next chunk and return any items it completed."""
+        items = []
+        capture_from = 0 if self._parts is not None else None
+        key_from = 0 if self._key_parts is not None else None
+        
+        for match in _JSON_STRUCT_RE.finditer(delta):
+            char, i = match.group(), match.start()
+            pos = self._offset + i
+            
+            if self._in_string:
+                if pos == self._escaped_at:
+                    continue
+                if char == "\\":
+                    self._escaped_at = pos + 1
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_parts is not None:
+                        self._key_parts.append(delta[key_from:i])
+                        self._last_key = "".join(self._key_parts)
+                        self._key_parts = key_from = None
+                continue
+            
+            depth = len(self._stack)
+            if char == '"':
+                self._in_string = True
+                # Strings directly in the top-level object are keys or
+                # scalar values; the one before a "[" is that list's key
+                if depth == 1:
+                    self._key_parts = []
+                    key_from = i + 1
+            elif char == "[":
+                if depth == 1:
+                    self._in_list = self._last_key == self.list_key
+                self._stack.append(char)
+            elif char == "{":
+                if depth == 2 and self._in_list:
+                    self._parts = []
+                    capture_from = i
+                self._stack.append(char)
+            elif self._stack:
+                if char == "}" and depth == 3 and self._parts is not None:
+                    self._parts.append(delta[capture_from:i + 1])
+                    items.append("".join(self._parts))
+                    self._parts = capture_from = None
+                elif char == "]" and depth == 2:
+                    self._in_list = False
+                self._stack.pop()
+        
+        if self._parts is not None:
+            self._parts.append(delta[capture_from:])
+        if self._key_parts is not None:
+            self._key_parts.append(delta[key_from:])
+        self._offset += len(delta)
+        
+        return items
+
+
+class _StreamMonitor:
+    """Watches a streamed LLM response chunk by chunk.
+    
+    Logs a progress event each time another item marker (e.g. a
+    "hypothesis_id" key) arrives, and aborts as soon as the response
+    visibly is not JSON. With an item model and the name of the list
+    holding the items, each item is parsed and validated as soon as it
+    closes, and the request is aborted on the first invalid one instead
+    of after the whole response has arrived.
+    """
+    
+    def __init__(
+        self,
+        agent: "BaseAgent",
+        item_marker: str,
+        item_model: Optional[Type[BaseModel]] = None,
+        item_list: Optional[str] = None
+    ):
+        self.agent = agent
+        self.item_marker = item_marker
+        self.item_model = item_model
+        self.items_seen = 0
+        self._parser = (
+            _StreamItemParser(item_list) if item_model is not None and item_list else None
+        )
+        self._started = False
+        self._tail = ""
+    
+    def __call__(self, delta: str):
+        if not self._started:
+            head = delta.lstrip()
+            if head:
+                self._started = True
+                if head[0] not in "{`":
+                    raise ValueError(f"LLM response is not JSON: {head[:50]!r}")
+        
+        # Keep the end of the previous chunk so split markers still match
+        window = self._tail + delta
+        self._tail = window[-(len(self.item_marker) - 1):]
+        new_items = window.count(self.item_marker)
+        
+        if new_items:
+            self.items_seen += new_items
+            self.agent._log_event("llm_stream_progress", {"items_received": self.items_seen})
+        
+        if self._parser is not None:
+            for item_text in self._parser.feed(delta):
+                self._validate_item(item_text)
+    
+    def _validate_item(self, item_text: str):
+        """Parse and validate one streamed item, aborting the stream if it is bad."""
+        try:
+            construct_trusted(
+                self.item_model, json.loads(item_text), strict=self.agent.strict_validation
+            )
+        except (json.JSONDecodeError, ValidationError) as e:
+            raise ValueError(f"Streamed {self.item_model.__name__} is invalid: {e}") from e
+
 
 class BaseAgent(ABC):
     """Abstract base class for all agents."""
     
+    # JSON key that starts each item of the agent's output; when set,
+    # responses are streamed and progress is logged per item
+    stream_item_marker: Optional[str] = None
+    
+    # Schema of those items and the top-level list field holding them;
+    # when both are set, each item is validated as it streams in
+    stream_item_model: Optional[Type[BaseModel]] = None
+    stream_item_list: Optional[str] = None
+    
     def __init__(
         self,
         agent_name: str,
         system_prompt: str,
         llm_client: Optional[LLMClient] = None,
-        structured_logger: Optional[StructuredLogger] = None
+        structured_logger: Optional[StructuredLogger] = None,
+        llm_cache: Optional[LLMCache] = None,
+        strict_validation: bool = False
     ):
         """Initialize base agent.
         
         Args:
             agent_name: Name of the agent
             system_prompt: System prompt defining agent behavior
-            llm_client: LLM API client (creates new if None)
+            llm_client: LLM API client (shared default client if None)
             structured_logger: Logger instance
+            llm_cache: Response cache checked before calling the LLM
+            strict_validation: Fully validate parsed LLM output even when
+                it already matches the schema
         """
         self.agent_name = agent_name
-        self.system_prompt = system_prompt
-        self.llm_client = llm_client or LLMClient()
+        self.system_prompt = _stable_prompt(system_prompt)
+        self.llm_client = llm_client or get_default_client()
         self.structured_logger = structured_logger
+        self.llm_cache = llm_cache
+        self.strict_validation = strict_validation
         
-        logger.info(f"Initialized {self.agent_name}")
+        logger.info("Initialized %s", self.agent_name)
         
     @abstractmethod
     def execute(self, **kwargs) -> Dict[str, Any]:
@@ -48,33 +250,112 @@ class BaseAgent(ABC):
         """
         pass
     
-    def _call_llm(self, user_prompt: str) -> str:
+    def _call_llm(
+        self,
+        user_prompt: str,
+        json_mode: bool = True,
+        query: Optional[str] = None
+    ) -> str:
         """Call LLM API with error handling.
         
+        Identical prompts are answered from llm_cache when one is set. If
+        its similarity tier is enabled and query is given, so are prompts
+        that are identical apart from a near-duplicate query.
+        
         Args:
             user_prompt: User message
+            json_mode: Ask the provider for a bare JSON object response
+            query: The user's query as embedded in user_prompt
             
         Returns:
             LLM response text
         """
+        cache_key = cache_scope = None
+        if self.llm_cache is not None:
+            model = getattr(self.llm_client, "model", "")
+            cache_key = LLMCache.make_key(
+                self.system_prompt,
+                user_prompt,
+                model=model,
+                agent_name=self.agent_name
+            )
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                self._log_event("llm_cache_hit", {
+                    "key": cache_key[:16],
+                    "response_length": len(cached)
+                })
+                return cached
+            
+            # Everything around the query must match exactly; only the
+            # query itself is compared for similarity
+            start = user_prompt.rfind(query) if query and query.strip() else -1
+            if start >= 0:
+                cache_scope = LLMCache.make_scope(
+                    self.system_prompt,
+                    user_prompt[:start] + user_prompt[start + len(query):],
+                    model=model,
+                    agent_name=self.agent_name
+                )
+                cached = self.llm_cache.get_similar(cache_scope, query)
+                if cached is not None:
+                    self._log_event("llm_cache_similar_hit", {
+                        "key": cache_key[:16],
+                        "response_length": len(cached)
+                    })
+                    return cached
+        
         try:
             self._log_event("llm_call_start", {"prompt_length": len(user_prompt)})
             
+            stream_args = {}
+            if self.stream_item_marker:
+                stream_args["on_delta"] = _StreamMonitor(
+                    self, self.stream_item_marker, self.stream_item_model, self.stream_item_list
+                )
+            
             response = self.llm_client.generate(
                 system_prompt=self.system_prompt,
-                user_prompt=user_prompt
+                user_prompt=user_prompt,
+                json_mode=json_mode,
+                **stream_args
             )
             
             self._log_event("llm_call_success", {
                 "response_length": len(response)
             })
             
+            if cache_key is not None:
+                self.llm_cache.set(cache_key, response, scope=cache_scope, query=query)
+            
             return response
             
         except Exception as e:
             self._log_event("llm_call_error", {"error": str(e)}, status="error")
             raise
     
+    def _parse_json_typed(self, response: str, schema: Type[ModelT]) -> Optional[ModelT]:
+        """Decode and validate a bare-JSON response against schema in one pass.
+        
+        Uses pydantic-core's JSON parser, so there is no intermediate dict
+        and no second validation pass.
+        
+        Args:
+            response: Raw LLM response
+            schema: Pydantic model describing the expected response
+            
+        Returns:
+            Parsed model, or None if the response is not bare JSON matching
+            schema (callers then fall back to _parse_json_response)
+        """
+        try:
+            parsed = schema.model_validate_json(response)
+        except ValidationError:
+            return None
+        
+        self._log_event("json_parse_success", {"keys": sorted(parsed.model_fields_set)})
+        return parsed
+    
     def _parse_json_response(self, response: str) -> Dict[str, Any]:
         """Extract and parse JSON from LLM response.
         
@@ -84,14 +365,21 @@ class BaseAgent(ABC):
         Returns:
             Parsed JSON as dictionary
         """
+        # Fast path: JSON-mode responses are a bare object
         try:
-            # Try to find JSON in markdown code blocks
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0].strip()
-            elif "```" in response:
-                json_str = response.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = response.strip()
+            parsed = json.loads(response)
+        except json.JSONDecodeError:
+            parsed = None
+        
+        if isinstance(parsed, dict):
+            self._log_event("json_parse_success", {"keys": list(parsed.keys())})
+            return parsed
+        
+        try:
+            # Try to find JSON in markdown code blocks (only scanned when
+            # a fence is present at all)
+            block_match = _JSON_BLOCK_RE.search(response) if "```" in response else None
+            json_str = block_match.group(1) if block_match else response.strip()
             
             parsed = json.loads(json_str)
             self._log_event("json_parse_success", {"keys": list(parsed.keys())})
@@ -104,13 +392,14 @@ class BaseAgent(ABC):
                 "response_preview": response[:200]
             }, status="error")
             
-            # Try to extract JSON more aggressively
-            import re
-            json_match = re.search(r'\{.*\}', response, re.DOTALL)
-            if json_match:
+            # Try to extract JSON more aggressively: the outermost {...},
+            # found with two string scans instead of a DOTALL regex
+            start = response.find("{")
+            end = response.rfind("}")
+            if start != -1 and end > start:
                 try:
-                    return json.loads(json_match.group())
-                except:
+                    return json.loads(response[start:end + 1])
+                except json.JSONDecodeError:
                     pass
             
             raise ValueError(f"Could not parse JSON from response: {response[:200]}...")
@@ -136,6 +425,39 @@ class BaseAgent(ABC):
         self._log_event("validation_success", {"validated_keys": required_keys})
         return True
     
+    def _require_items(self, items: list, name: str):
+        """Fail fast when the LLM returned no items for a list field.
+        
+        Checked before any model construction, so an empty response costs
+        one log event instead of a Pydantic validation pass.
+        
+        Args:
+            items: Raw or parsed list from the response
+            name: Field name, for the error message
+            
+        Raises:
+            ValueError: If items is missing or empty
+        """
+        if not items:
+            self._log_event("empty_response", {"field": name}, status="error")
+            raise ValueError(f"LLM response has no {name}")
+    
+    def _log_payload(self, obj: Any) -> Any:
+        """Prepare a large input for a log event.
+        
+        Args:
+            obj: Payload to log
+            
+        Returns:
+            obj itself when the structured logger is verbose, otherwise
+            its digest
+        """
+        if self.structured_logger is None:
+            return None
+        if self.structured_logger.verbose:
+            return obj
+        return _digest(obj)
+    
     def _log_event(
         self,
         event_type: str,
@@ -157,8 +479,9 @@ class BaseAgent(ABC):
                 status=status
             )
         
-        # Also log to standard logger
-        logger.info(f"[{self.agent_name}] {event_type}: {status}")
+        # Also log to standard logger (formatted only if INFO is enabled)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("[%s] %s: %s", self.agent_name, event_type, status)
     
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(name={self.agent_name})"
@@ -1,17 +1,26 @@
 """Creative Generator Agent - Produces data-driven recommendations."""
 
 from typing import Dict, Any, List
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from agents.base_agent import BaseAgent
 from prompts.creative_prompts import CREATIVE_GENERATOR_SYSTEM_PROMPT, format_creative_generator_prompt
 from utils.validators import CreativeAnalysis, CreativeRecommendation, Insight
-from utils.data_processors import load_fb_ads_data, get_performance_by_dimension
+from utils.data_processors import get_date_window_views, FBAdsData
+from utils.data_cache import load_fb_ads_views_cached, load_performance_by_dimension_cached
 from pydantic import ValidationError
 from datetime import datetime
+import numpy as np
+import pandas as pd
 
 
 class CreativeGeneratorAgent(BaseAgent):
     """Agent that generates creative recommendations."""
     
+    stream_item_marker = '"recommendation_id"'
+    stream_item_model = CreativeRecommendation
+    stream_item_list = "recommendations"
+    
     def __init__(self, **kwargs):
         super().__init__(
             agent_name="CreativeGeneratorAgent",
@@ -38,41 +47,44 @@ class CreativeGeneratorAgent(BaseAgent):
         })
         
         # Load data for analysis
-        df = load_fb_ads_data(data_file_path)
-        
-        # Analyze creative performance
-        creative_perf = get_performance_by_dimension(df, 'creative_type')
-        platform_perf = get_performance_by_dimension(df, 'platform')
-        
-        # Get top and bottom performers
-        top_performers = self._get_top_performers(df)
-        underperformers = self._get_underperformers(df)
+        data = load_fb_ads_views_cached(data_file_path)
         
-        # Identify patterns
-        winning_patterns = self._identify_patterns(df, top_performers)
-        losing_patterns = self._identify_patterns(df, underperformers, winning=False)
+        # Analyze creative performance (shared with the data agent's breakdowns)
+        creative_perf = load_performance_by_dimension_cached(data_file_path, 'creative_type')
+        platform_perf = load_performance_by_dimension_cached(data_file_path, 'platform')
         
         # Prepare context for LLM
+        creative_perf_dict = creative_perf.to_dict('index')
         performance_summary = {
-            "creative_type": creative_perf.to_dict('index'),
+            "creative_type": creative_perf_dict,
             "platform": platform_perf.to_dict('index')
         }
         
         budget_info = {
-            "total_spend": df['spend'].sum(),
-            "by_creative_type": df.groupby('creative_type')['spend'].sum().to_dict()
+            "total_spend": data.total_spend,
+            "by_creative_type": {
+                creative_type: perf['spend']
+                for creative_type, perf in creative_perf_dict.items()
+            }
         }
         
         # Format prompt
         user_prompt = format_creative_generator_prompt(
-            validated_insights=[i.model_dump() for i in validated_insights],
+            validated_insights=[i.dumped for i in validated_insights],
             performance_summary=performance_summary,
-            creative_breakdown=creative_perf.to_dict('index'),
+            creative_breakdown=creative_perf_dict,
             budget_info=budget_info
         )
         
-        # Call LLM
-        response = self._call_llm(user_prompt)
+        # The per-creative analysis is not part of the prompt, so it runs
+        # while the LLM call is in flight
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            analysis_future = executor.submit(self._analyze_creatives, data)
+            
+            # Call LLM
+            response = self._call_llm(user_prompt)
+            
+            creative_stats = analysis_future.result()
         
         # Parse response
         analysis_dict = self._parse_json_response(response)
@@ -89,15 +101,15 @@ class CreativeGeneratorAgent(BaseAgent):
             
             creative_analysis = CreativeAnalysis(
                 analysis_date=datetime.now(),
-                top_performing_creatives=top_performers,
-                underperforming_creatives=underperformers,
-                winning_patterns=winning_patterns,
-                losing_patterns=losing_patterns,
+                top_performing_creatives=creative_stats["top_performers"],
+                underperforming_creatives=creative_stats["underperformers"],
+                winning_patterns=creative_stats["winning_patterns"],
+                losing_patterns=creative_stats["losing_patterns"],
                 recommendations=recommendations,
                 overall_creative_performance={
                     "avg_roas_by_type": creative_perf['roas'].to_dict(),
-                    "best_performing_segment": self._get_best_segment(df),
-                    "creative_fatigue_detected": self._detect_fatigue(df)
+                    "best_performing_segment": creative_stats["best_performing_segment"],
+                    "creative_fatigue_detected": creative_stats["creative_fatigue_detected"]
                 }
             )
             
@@ -112,73 +124,127 @@ class CreativeGeneratorAgent(BaseAgent):
             self._log_event("validation_error", {"error": str(e)}, status="error")
             raise ValueError(f"Creative analysis validation failed: {e}")
     
-    def _get_top_performers(self, df, top_n: int = 5) -> List[Dict[str, Any]]:
-        """Get top performing creatives.
+    def _analyze_creatives(self, data: FBAdsData) -> Dict[str, Any]:
+        """Rank creatives and find patterns, fatigue and the best segment.
+        
+        Args:
+            data: Facebook Ads data with precomputed totals
+            
+        Returns:
+            Dictionary of per-creative analysis results
+        """
+        df = data.df
+        
+        # Aggregate once per creative; reused by all ranking helpers
+        grouped = self._group_creatives(df)
+        total_spend = data.total_spend
+        
+        # Get top and bottom performers
+        top_performers = self._get_top_performers(grouped)
+        underperformers = self._get_underperformers(grouped, total_spend)
+        
+        return {
+            "top_performers": top_performers,
+            "underperformers": underperformers,
+            "winning_patterns": self._identify_patterns(df, top_performers),
+            "losing_patterns": self._identify_patterns(df, underperformers, winning=False),
+            "best_performing_segment": self._get_best_segment(grouped, total_spend),
+            "creative_fatigue_detected": self._detect_fatigue(df)
+        }
+    
+    def _group_creatives(self, df) -> pd.DataFrame:
+        """Aggregate performance per creative (type, platform, message).
+        
+        Keeps ROAS sum and row count alongside the mean so coarser
+        segments can be derived from this table without rescanning df.
         
         Args:
             df: Dataset
+            
+        Returns:
+            One row per creative with aggregated metrics
+        """
+        return df.groupby(
+            ['creative_type', 'platform', 'creative_message'],
+            sort=False,
+            observed=True
+        ).agg(
+            roas=('roas', 'mean'),
+            roas_sum=('roas', 'sum'),
+            rows=('roas', 'count'),
+            spend=('spend', 'sum'),
+            revenue=('revenue', 'sum'),
+            ctr=('ctr', 'mean')
+        ).reset_index()
+    
+    def _get_top_performers(self, grouped, top_n: int = 5) -> List[Dict[str, Any]]:
+        """Get top performing creatives.
+        
+        Args:
+            grouped: Per-creative aggregates from _group_creatives
             top_n: Number of top performers
             
         Returns:
             List of top performer details
         """
-        # Group by creative attributes and calculate ROAS
-        grouped = df.groupby(['creative_type', 'platform', 'creative_message']).agg({
-            'roas': 'mean',
-            'spend': 'sum',
-            'revenue': 'sum',
-            'ctr': 'mean'
-        }).reset_index()
-        
         # Sort by ROAS and get top N
         top = grouped.nlargest(top_n, 'roas')
         
-        return [
-            {
-                "creative_type": row['creative_type'],
-                "platform": row['platform'],
-                "message_preview": row['creative_message'][:50] + "...",
-                "roas": round(row['roas'], 2),
-                "spend": round(row['spend'], 2),
-                "ctr": round(row['ctr'], 3)
-            }
-            for _, row in top.iterrows()
-        ]
+        return self._creative_details(top)
     
-    def _get_underperformers(self, df, bottom_n: int = 5) -> List[Dict[str, Any]]:
+    def _get_underperformers(
+        self,
+        grouped,
+        total_spend: float,
+        bottom_n: int = 5
+    ) -> List[Dict[str, Any]]:
         """Get underperforming creatives.
         
         Args:
-            df: Dataset
+            grouped: Per-creative aggregates from _group_creatives
+            total_spend: Total spend across the dataset
             bottom_n: Number of bottom performers
             
         Returns:
             List of underperformer details
         """
-        grouped = df.groupby(['creative_type', 'platform', 'creative_message']).agg({
-            'roas': 'mean',
-            'spend': 'sum',
-            'revenue': 'sum',
-            'ctr': 'mean'
-        }).reset_index()
-        
         # Filter for significant spend (>1% of total)
-        total_spend = df['spend'].sum()
         grouped = grouped[grouped['spend'] > total_spend * 0.01]
         
         # Sort by ROAS and get bottom N
         bottom = grouped.nsmallest(bottom_n, 'roas')
         
+        return self._creative_details(bottom)
+    
+    def _creative_details(self, creatives) -> List[Dict[str, Any]]:
+        """Build creative detail dicts from aggregated rows.
+        
+        Reads the underlying column arrays once instead of materializing
+        a Series per row with iterrows().
+        
+        Args:
+            creatives: Rows of the per-creative aggregate table
+            
+        Returns:
+            List of creative details
+        """
+        creative_types = creatives['creative_type'].to_numpy()
+        platforms = creatives['platform'].to_numpy()
+        messages = creatives['creative_message'].to_numpy()
+        roas = creatives['roas'].to_numpy()
+        spend = creatives['spend'].to_numpy()
+        ctr = creatives['ctr'].to_numpy()
+        
         return [
             {
-                "creative_type": row['creative_type'],
-                "platform": row['platform'],
-                "message_preview": row['creative_message'][:50] + "...",
-                "roas": round(row['roas'], 2),
-                "spend": round(row['spend'], 2),
-                "ctr": round(row['ctr'], 3)
+                "creative_type": creative_types[i],
+                "platform": platforms[i],
+                "message_preview": messages[i][:50] + "...",
+                "roas": round(roas[i], 2),
+                "spend": round(spend[i], 2),
+                "ctr": round(ctr[i], 3)
             }
-            for _, row in bottom.iterrows()
+            for i in range(len(creatives))
         ]
     
     def _identify_patterns(
@@ -203,40 +269,42 @@ class CreativeGeneratorAgent(BaseAgent):
             return patterns
         
         # Analyze creative type distribution
-        creative_types = [e['creative_type'] for e in examples]
-        if len(set(creative_types)) < len(creative_types):
-            most_common = max(set(creative_types), key=creative_types.count)
+        creative_types = Counter(e['creative_type'] for e in examples)
+        if len(creative_types) < len(examples):
+            most_common = creative_types.most_common(1)[0][0]
             patterns.append(
                 f"{'Best' if winning else 'Worst'} performers dominated by {most_common} format"
             )
         
         # Analyze platform distribution
-        platforms = [e['platform'] for e in examples]
-        if len(set(platforms)) < len(platforms):
-            most_common = max(set(platforms), key=platforms.count)
+        platforms = Counter(e['platform'] for e in examples)
+        if len(platforms) < len(examples):
+            most_common = platforms.most_common(1)[0][0]
             patterns.append(
                 f"{most_common} shows {'stronger' if winning else 'weaker'} performance in this set"
             )
         
         return patterns
     
-    def _get_best_segment(self, df) -> str:
+    def _get_best_segment(self, grouped, total_spend: float) -> str:
         """Identify best performing segment.
         
         Args:
-            df: Dataset
+            grouped: Per-creative aggregates from _group_creatives
+            total_spend: Total spend across the dataset
             
         Returns:
             Description of best segment
         """
-        # Find combination with highest ROAS
-        grouped = df.groupby(['creative_type', 'platform']).agg({
-            'roas': 'mean',
-            'spend': 'sum'
-        }).reset_index()
+        # Roll creatives up to (type, platform); ROAS stays a row-level mean
+        grouped = grouped.groupby(
+            ['creative_type', 'platform'],
+            observed=True
+        )[['roas_sum', 'rows', 'spend']].sum().reset_index()
+        grouped['roas'] = grouped['roas_sum'] / grouped['rows']
         
         # Filter for significant spend
-        grouped = grouped[grouped['spend'] > df['spend'].sum() * 0.05]
+        grouped = grouped[grouped['spend'] > total_spend * 0.05]
         
         best = grouped.loc[grouped['roas'].idxmax()]
         
@@ -251,12 +319,12 @@ class CreativeGeneratorAgent(BaseAgent):
         Returns:
             True if fatigue detected
         """
-        # Sort by date and calculate rolling CTR
-        df_sorted = df.sort_values('date')
+        # Earliest and latest 7 rows by date, without sorting the frame
+        first_rows, last_rows = get_date_window_views(df, ('ctr',))['ctr']
         
         # Compare first and last week CTR
-        first_week = df_sorted.head(7)['ctr'].mean()
-        last_week = df_sorted.tail(7)['ctr'].mean()
+        first_week = np.nanmean(first_rows)
+        last_week = np.nanmean(last_rows)
         
         # Fatigue if CTR dropped more than 20%
         return last_week < first_week * 0.8
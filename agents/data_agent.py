@@ -4,12 +4,14 @@ from typing import Dict, Any, List
 from agents.base_agent import BaseAgent
 from prompts.data_prompts import DATA_AGENT_SYSTEM_PROMPT, format_data_agent_prompt
 from utils.validators import DataSummary
-from utils.data_processors import (
-    load_fb_ads_data,
-    calculate_metrics,
-    get_performance_by_dimension
+from utils.data_cache import (
+    load_fb_ads_views_cached,
+    load_metrics_cached,
+    load_performance_by_dimension_cached
 )
+from utils.data_processors import get_date_window_views, FBAdsData
 from pydantic import ValidationError
+import numpy as np
 import json
 
 
@@ -40,21 +42,22 @@ class DataAgent(BaseAgent):
         self._log_event("data_load_start", {"file": data_file_path})
         
         # Load actual data
-        df = load_fb_ads_data(data_file_path)
+        data = load_fb_ads_views_cached(data_file_path)
+        df = data.df
         
         # Calculate metrics
-        metrics = calculate_metrics(df)
+        metrics = load_metrics_cached(data_file_path)
         
-        # Get dimensional breakdowns
-        creative_perf = get_performance_by_dimension(df, 'creative_type').to_dict('index')
-        platform_perf = get_performance_by_dimension(df, 'platform').to_dict('index')
-        country_perf = get_performance_by_dimension(df, 'country').to_dict('index')
+        # Get dimensional breakdowns (aggregated once per file version)
+        creative_perf = load_performance_by_dimension_cached(data_file_path, 'creative_type').to_dict('index')
+        platform_perf = load_performance_by_dimension_cached(data_file_path, 'platform').to_dict('index')
+        country_perf = load_performance_by_dimension_cached(data_file_path, 'country').to_dict('index')
         
         # Get unique campaigns
-        campaigns = df['campaign_name'].unique().tolist()
+        campaigns = data.campaigns
         
         # Detect anomalies
-        anomalies = self._detect_anomalies(df)
+        anomalies = self._detect_anomalies(data)
         
         # Create DataSummary
         data_summary = DataSummary(
@@ -78,21 +81,25 @@ class DataAgent(BaseAgent):
         
         return data_summary
     
-    def _detect_anomalies(self, df) -> List[str]:
+    def _detect_anomalies(self, data: FBAdsData) -> List[str]:
         """Detect performance anomalies in the data.
         
         Args:
-            df: Facebook Ads dataframe
+            data: Facebook Ads data with column arrays
             
         Returns:
             List of anomaly descriptions
         """
         anomalies = []
         
+        # Earliest/latest 7 rows by date; both metrics share the partition
+        views = get_date_window_views(data.df, ('roas', 'ctr'))
+        
         # Check for ROAS drops
-        df_sorted = df.sort_values('date')
-        recent_roas = df_sorted.tail(7)['roas'].mean()
-        previous_roas = df_sorted.head(7)['roas'].mean()
+        # nanmean skips missing values, as pandas .mean() does
+        previous_rows, recent_rows = views['roas']
+        recent_roas = np.nanmean(recent_rows)
+        previous_roas = np.nanmean(previous_rows)
         
         if recent_roas < previous_roas * 0.8:
             anomalies.append(
@@ -101,8 +108,9 @@ class DataAgent(BaseAgent):
             )
         
         # Check for CTR drops
-        recent_ctr = df_sorted.tail(7)['ctr'].mean()
-        previous_ctr = df_sorted.head(7)['ctr'].mean()
+        previous_rows, recent_rows = views['ctr']
+        recent_ctr = np.nanmean(recent_rows)
+        previous_ctr = np.nanmean(previous_rows)
         
         if recent_ctr < previous_ctr * 0.85:
             anomalies.append(
@@ -111,12 +119,30 @@ class DataAgent(BaseAgent):
             )
         
         # Check for high spend segments with low ROAS
-        for creative_type in df['creative_type'].unique():
-            subset = df[df['creative_type'] == creative_type]
-            if subset['roas'].mean() < 3.0 and subset['spend'].sum() > df['spend'].sum() * 0.15:
-                anomalies.append(
-                    f"{creative_type} creatives consuming {(subset['spend'].sum() / df['spend'].sum() * 100):.1f}% "
-                    f"of budget but ROAS only {subset['roas'].mean():.2f}"
-                )
+        # (one bincount pass per column over the factorized creative types)
+        total_spend = data.total_spend
+        codes = data.creative_type_codes
+        has_type = codes >= 0  # factorize marks missing types with -1
+        codes = codes[has_type]
+        num_types = len(data.creative_types)
+        type_spend = np.bincount(
+            codes, weights=np.nan_to_num(data.spend[has_type], nan=0.0), minlength=num_types
+        )
+        
+        # Mean over rows with a ROAS value, skipping missing ones like pandas
+        roas = data.roas[has_type]
+        has_roas = np.isfinite(roas)
+        roas_counts = np.bincount(codes[has_roas], minlength=num_types)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            type_roas = np.bincount(
+                codes[has_roas], weights=roas[has_roas], minlength=num_types
+            ) / roas_counts
+        
+        flagged = np.flatnonzero((type_roas < 3.0) & (type_spend > total_spend * 0.15))
+        for code in flagged:
+            anomalies.append(
+                f"{data.creative_types[code]} creatives consuming {(type_spend[code] / total_spend * 100):.1f}% "
+                f"of budget but ROAS only {type_roas[code]:.2f}"
+            )
         
         return anomalies
@@ -1,13 +1,17 @@
 """Evaluator Agent - Validates hypotheses with statistical tests."""
 
 from typing import Dict, Any, List
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from agents.base_agent import BaseAgent
 from prompts.evaluator_prompts import EVALUATOR_AGENT_SYSTEM_PROMPT, format_evaluator_prompt
 from utils.validators import (
     EvaluatorOutput, ValidationResult, Hypothesis, Insight,
     HypothesisStatus
 )
-from utils.data_processors import load_fb_ads_data
+from utils.data_cache import load_fb_ads_views_cached
+from utils.data_processors import FBAdsData
+from utils.stats_kernels import batch_two_sample_stats, segment_two_sample_stats
 from pydantic import ValidationError
 import pandas as pd
 from scipy import stats
@@ -24,6 +28,7 @@ class EvaluatorAgent(BaseAgent):
             **kwargs
         )
         self.confidence_threshold = confidence_threshold
+        self._pending_events: List[Dict[str, Any]] = []
     
     def execute(
         self,
@@ -42,25 +47,41 @@ class EvaluatorAgent(BaseAgent):
         self._log_event("validation_start", {"num_hypotheses": len(hypotheses)})
         
         # Load data for validation
-        df = load_fb_ads_data(data_file_path)
+        data = load_fb_ads_views_cached(data_file_path)
+        df = data.df
         
         validation_results = []
         validated_insights = []
         rejected_hypotheses = []
+        self._pending_events = []
         
-        for hypothesis in hypotheses:
-            result = self._validate_hypothesis(hypothesis, df)
+        # Two-sample statistics for every hypothesis in one batch per metric
+        group_stats = self._compute_group_stats(hypotheses, df)
+        
+        for hypothesis, hypothesis_stats in zip(hypotheses, group_stats):
+            result = self._validate_hypothesis(hypothesis, hypothesis_stats)
             validation_results.append(result)
             
             if result.status == HypothesisStatus.VALIDATED:
                 # Create Insight from validated hypothesis
-                insight = self._create_insight(hypothesis, result, df)
+                insight = self._create_insight(hypothesis, result, data)
                 validated_insights.append(insight)
             else:
                 rejected_hypotheses.append(hypothesis.hypothesis_id)
         
+        # One event for all per-hypothesis steps instead of one each
+        has_errors = any(step.get("error") for step in self._pending_events)
+        self._log_event(
+            "validation_batch",
+            {"steps": self._pending_events},
+            status="error" if has_errors else "success"
+        )
+        
+        # Tally all statuses in one pass
+        status_counts = Counter(r.status for r in validation_results)
+        
         # Determine if replanning needed
-        num_validated = len(validated_insights)
+        num_validated = status_counts[HypothesisStatus.VALIDATED]
         needs_replan = num_validated < 2
         replan_reason = None
         
@@ -73,7 +94,10 @@ class EvaluatorAgent(BaseAgent):
             rejected_hypotheses=rejected_hypotheses,
             needs_replan=needs_replan,
             replan_reason=replan_reason,
-            suggested_focus_areas=self._suggest_focus_areas(validation_results)
+            suggested_focus_areas=self._suggest_focus_areas(
+                status_counts[HypothesisStatus.REJECTED],
+                len(validation_results)
+            )
         )
         
         self._log_event("validation_complete", {
@@ -84,56 +108,164 @@ class EvaluatorAgent(BaseAgent):
         
         return evaluator_output
     
+    def _compute_group_stats(
+        self,
+        hypotheses: List[Hypothesis],
+        df: pd.DataFrame
+    ) -> List[Any]:
+        """Compute group statistics for all hypotheses in vectorized batches.
+        
+        Segment hypotheses are answered from per-segment sufficient
+        statistics (segment_two_sample_stats), one bincount pass per
+        (metric, dimension) however many segments are tested. Dimensions
+        that are not categorical are factorized once into the same integer
+        codes, instead of comparing the column against every tested value.
+        Any other hypothesis is reduced to a boolean mask over the rows
+        (a segment value absent from the data, or first half of the
+        date-sorted data when no segment is given); masks testing the same
+        metric are stacked into an (H, N) matrix and handed to
+        batch_two_sample_stats. Batches run on a thread pool.
+        
+        Args:
+            hypotheses: Hypotheses to validate
+            df: Full dataset
+            
+        Returns:
+            Per-hypothesis dict of statistics, or the exception raised while
+            building its groups
+        """
+        n_rows = len(df)
+        group_stats: List[Any] = [None] * len(hypotheses)
+        batches: Dict[tuple, Dict[str, list]] = {}
+        segment_codes: Dict[str, tuple] = {}
+        
+        def codes_for(dimension: str) -> tuple:
+            # (row codes, segment values) per dimension, built once per call
+            if dimension not in segment_codes:
+                column = df[dimension]
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    segment_codes[dimension] = (column.cat.codes.to_numpy(), column.cat.categories)
+                else:
+                    codes, uniques = pd.factorize(column)
+                    segment_codes[dimension] = (codes, pd.Index(uniques))
+            return segment_codes[dimension]
+        
+        for i, hypothesis in enumerate(hypotheses):
+            try:
+                metric = hypothesis.metric_to_test
+                if metric not in df.columns:
+                    raise KeyError(metric)
+                if not pd.api.types.is_numeric_dtype(df[metric]):
+                    raise TypeError(f"Metric {metric!r} is not numeric")
+                
+                dimension = hypothesis.segment_dimension
+                if dimension and hypothesis.segment_value:
+                    _, segments = codes_for(dimension)
+                    code = int(segments.get_indexer([hypothesis.segment_value])[0])
+                    if code >= 0:
+                        batch = batches.setdefault((metric, dimension), {"indices": [], "codes": []})
+                        batch["indices"].append(i)
+                        batch["codes"].append(code)
+                        continue
+                    mask = np.zeros(n_rows, dtype=bool)
+                else:
+                    # Time-based comparison if no segment specified
+                    mask = np.arange(n_rows) < n_rows // 2
+            except Exception as e:
+                group_stats[i] = e
+                continue
+            
+            batch = batches.setdefault((metric, None), {"indices": [], "masks": []})
+            batch["indices"].append(i)
+            batch["masks"].append(mask)
+        
+        keys = list(batches)
+        
+        def run_batch(key: tuple) -> Dict[str, np.ndarray]:
+            metric, dimension = key
+            values = df[metric].to_numpy(dtype=np.float64)
+            
+            if dimension is None:
+                batch_stats = batch_two_sample_stats(values, np.vstack(batches[key]["masks"]))
+            else:
+                row_codes, segments = segment_codes[dimension]
+                segment_stats = segment_two_sample_stats(values, row_codes, len(segments))
+                codes = batches[key]["codes"]
+                batch_stats = {name: per_segment[codes] for name, per_segment in segment_stats.items()}
+            
+            with np.errstate(invalid='ignore'):
+                batch_stats["p_value"] = 2 * stats.t.sf(
+                    np.abs(batch_stats["t_stat"]), batch_stats["dof"]
+                )
+            return batch_stats
+        
+        # Batches are independent and NumPy/SciPy release the GIL
+        if len(keys) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(keys))) as executor:
+                batch_results = list(executor.map(run_batch, keys))
+        else:
+            batch_results = [run_batch(key) for key in keys]
+        
+        for key, batch_stats in zip(keys, batch_results):
+            for row, i in enumerate(batches[key]["indices"]):
+                group_stats[i] = {
+                    "n_a": int(batch_stats["n_a"][row]),
+                    "n_b": int(batch_stats["n_b"][row]),
+                    "mean_a": float(batch_stats["mean_a"][row]),
+                    "mean_b": float(batch_stats["mean_b"][row]),
+                    "effect_size": float(batch_stats["effect_size"][row]),
+                    "p_value": float(batch_stats["p_value"][row])
+                }
+        
+        return group_stats
+    
     def _validate_hypothesis(
         self,
         hypothesis: Hypothesis,
-        df: pd.DataFrame
+        group_stats: Any
     ) -> ValidationResult:
-        """Validate a single hypothesis with statistical test.
+        """Validate a single hypothesis from its precomputed group statistics.
         
         Args:
             hypothesis: Hypothesis to validate
-            df: Full dataset
+            group_stats: Statistics from _compute_group_stats
             
         Returns:
             ValidationResult
         """
         try:
-            metric = hypothesis.metric_to_test
+            if isinstance(group_stats, Exception):
+                raise group_stats
             
-            # Segment data if specified
-            if hypothesis.segment_dimension and hypothesis.segment_value:
-                group_a = df[df[hypothesis.segment_dimension] == hypothesis.segment_value]
-                group_b = df[df[hypothesis.segment_dimension] != hypothesis.segment_value]
-            else:
-                # Time-based comparison if no segment specified
-                mid_point = len(df) // 2
-                group_a = df.iloc[:mid_point]
-                group_b = df.iloc[mid_point:]
+            metric = hypothesis.metric_to_test
+            n_a = group_stats["n_a"]
+            n_b = group_stats["n_b"]
             
             # Check sample sizes
-            if len(group_a) < 30 or len(group_b) < 30:
+            if n_a < 30 or n_b < 30:
+                self._pending_events.append({
+                    "hypothesis_id": hypothesis.hypothesis_id,
+                    "status": HypothesisStatus.NEEDS_MORE_DATA.value
+                })
                 return ValidationResult(
                     hypothesis_id=hypothesis.hypothesis_id,
                     status=HypothesisStatus.NEEDS_MORE_DATA,
                     confidence_score=0.3,
-                    verdict=f"Insufficient sample size (n_a={len(group_a)}, n_b={len(group_b)})",
+                    verdict=f"Insufficient sample size (n_a={n_a}, n_b={n_b})",
                     actionability="Collect more data before drawing conclusions"
                 )
             
-            # Perform t-test
-            stat, p_value = stats.ttest_ind(group_a[metric], group_b[metric])
+            p_value = group_stats["p_value"]
             
-            # Calculate effect size (Cohen's d)
-            mean_a = group_a[metric].mean()
-            mean_b = group_b[metric].mean()
-            pooled_std = np.sqrt((group_a[metric].std()**2 + group_b[metric].std()**2) / 2)
-            effect_size = abs(mean_a - mean_b) / pooled_std if pooled_std > 0 else 0
+            # Effect size (Cohen's d)
+            mean_a = group_stats["mean_a"]
+            mean_b = group_stats["mean_b"]
+            effect_size = group_stats["effect_size"]
             
             # Calculate confidence score
             sig_score = 1.0 if p_value < 0.05 else 0.5 if p_value < 0.10 else 0.0
             effect_score = 1.0 if effect_size > 0.5 else 0.6 if effect_size > 0.3 else 0.3
-            sample_score = 1.0 if min(len(group_a), len(group_b)) > 100 else 0.7
+            sample_score = 1.0 if min(n_a, n_b) > 100 else 0.7
             
             confidence_score = (0.4 * sig_score + 0.4 * effect_score + 0.2 * sample_score)
             
@@ -147,6 +279,11 @@ class EvaluatorAgent(BaseAgent):
                 verdict = f"Hypothesis rejected: No significant difference found (p={p_value:.3f}, effect_size={effect_size:.2f})"
                 actionability = "Focus on other hypotheses with stronger evidence"
             
+            self._pending_events.append({
+                "hypothesis_id": hypothesis.hypothesis_id,
+                "status": status.value
+            })
+            
             return ValidationResult(
                 hypothesis_id=hypothesis.hypothesis_id,
                 status=status,
@@ -158,18 +295,19 @@ class EvaluatorAgent(BaseAgent):
                     "group_a_mean": round(mean_a, 3),
                     "group_b_mean": round(mean_b, 3),
                     "difference": round(abs(mean_a - mean_b), 3),
-                    "sample_size_a": len(group_a),
-                    "sample_size_b": len(group_b)
+                    "sample_size_a": n_a,
+                    "sample_size_b": n_b
                 },
                 verdict=verdict,
                 actionability=actionability
             )
             
         except Exception as e:
-            self._log_event("validation_error", {
+            self._pending_events.append({
                 "hypothesis_id": hypothesis.hypothesis_id,
+                "status": HypothesisStatus.NEEDS_MORE_DATA.value,
                 "error": str(e)
-            }, status="error")
+            })
             
             return ValidationResult(
                 hypothesis_id=hypothesis.hypothesis_id,
@@ -183,20 +321,20 @@ class EvaluatorAgent(BaseAgent):
         self,
         hypothesis: Hypothesis,
         validation: ValidationResult,
-        df: pd.DataFrame
+        data: FBAdsData
     ) -> Insight:
         """Create an Insight from validated hypothesis.
         
         Args:
             hypothesis: Original hypothesis
             validation: Validation result
-            df: Dataset
+            data: Dataset with precomputed totals
             
         Returns:
             Insight object
         """
         # Estimate revenue impact
-        avg_daily_revenue = df['revenue'].sum() / len(df['date'].unique())
+        avg_daily_revenue = data.total_revenue / data.num_days
         estimated_impact = avg_daily_revenue * 0.1 * validation.confidence_score  # 10% base impact
         
         return Insight(
@@ -210,26 +348,25 @@ class EvaluatorAgent(BaseAgent):
             category="performance",
             urgency="high" if validation.confidence_score > 0.8 else "medium",
             time_period_analyzed={
-                "start": df['date'].min().strftime('%Y-%m-%d'),
-                "end": df['date'].max().strftime('%Y-%m-%d')
+                "start": data.start_date,
+                "end": data.end_date
             },
-            affected_campaigns=df['campaign_name'].unique().tolist()[:3]
+            affected_campaigns=data.campaigns[:3]
         )
     
-    def _suggest_focus_areas(self, validation_results: List[ValidationResult]) -> List[str]:
+    def _suggest_focus_areas(self, rejected_count: int, total_count: int) -> List[str]:
         """Suggest areas to focus on based on validation results.
         
         Args:
-            validation_results: List of validation results
+            rejected_count: Number of rejected hypotheses
+            total_count: Number of hypotheses evaluated
             
         Returns:
             List of focus area suggestions
         """
         suggestions = []
         
-        rejected_count = sum(1 for r in validation_results if r.status == HypothesisStatus.REJECTED)
-        
-        if rejected_count > len(validation_results) / 2:
+        if rejected_count > total_count / 2:
             suggestions.append("Consider different analytical dimensions (e.g., time-based, audience-based)")
             suggestions.append("Look for interaction effects between variables")
         
@@ -1,15 +1,30 @@
 """Insight Agent - Generates testable hypotheses."""
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from statistics import fmean
 from agents.base_agent import BaseAgent
 from prompts.insight_prompts import INSIGHT_AGENT_SYSTEM_PROMPT, format_insight_agent_prompt
-from utils.validators import InsightAgentOutput, Hypothesis, DataSummary
+from utils.validators import (
+    InsightAgentOutput, InsightResponse, Hypothesis, DataSummary, ConfidenceLevel,
+    construct_trusted, construct_trusted_many
+)
 from pydantic import ValidationError
 
+# Numeric weight of each hypothesis confidence level
+_CONFIDENCE_WEIGHTS = {
+    ConfidenceLevel.HIGH: 1.0,
+    ConfidenceLevel.MEDIUM: 0.5,
+    ConfidenceLevel.LOW: 0.2
+}
+
 
 class InsightAgent(BaseAgent):
     """Agent that generates hypotheses about performance."""
     
+    stream_item_marker = '"hypothesis_id"'
+    stream_item_model = Hypothesis
+    stream_item_list = "hypotheses_generated"
+    
     def __init__(self, **kwargs):
         super().__init__(
             agent_name="InsightAgent",
@@ -21,7 +36,8 @@ class InsightAgent(BaseAgent):
         self,
         query: str,
         data_summary: DataSummary,
-        focus_dimension: str = "all dimensions"
+        focus_dimension: str = "all dimensions",
+        feedback: Optional[str] = None
     ) -> InsightAgentOutput:
         """Generate hypotheses to explain performance patterns.
         
@@ -29,47 +45,66 @@ class InsightAgent(BaseAgent):
             query: User's question
             data_summary: Summary from DataAgent
             focus_dimension: Specific dimension to focus on
+            feedback: Evaluator feedback on earlier attempts, when replanning
             
         Returns:
             InsightAgentOutput with hypotheses
         """
-        self._log_event("hypothesis_generation_start", {"query": query})
+        self._log_event("hypothesis_generation_start", {
+            "query": query,
+            "data_summary": self._log_payload(data_summary.dumped)
+        })
         
         # Format prompt
         user_prompt = format_insight_agent_prompt(
             query=query,
-            data_summary=data_summary.model_dump(),
-            focus_dimension=focus_dimension
+            data_summary=data_summary.dumped,
+            focus_dimension=focus_dimension,
+            feedback=feedback
         )
         
         # Call LLM
-        response = self._call_llm(user_prompt)
+        response = self._call_llm(user_prompt, query=query)
         
-        # Parse response
-        output_dict = self._parse_json_response(response)
+        # Parse and validate in one pass; fall back to lenient parsing
+        # (code fences, stray text) when that fails
+        parsed = self._parse_json_typed(response, InsightResponse)
         
-        # Validate structure
-        self._validate_output(output_dict, ["hypotheses_generated", "reasoning"])
-        
-        # Convert to Pydantic models
         try:
-            hypotheses = [
-                Hypothesis(**hyp) for hyp in output_dict["hypotheses_generated"]
-            ]
+            if parsed is not None:
+                self._require_items(parsed.hypotheses_generated, "hypotheses_generated")
+                hypotheses = parsed.hypotheses_generated
+                reasoning = parsed.reasoning
+                confidence = parsed.confidence_in_hypotheses
+            else:
+                output_dict = self._parse_json_response(response)
+                
+                # Validate structure
+                self._validate_output(output_dict, ["hypotheses_generated", "reasoning"])
+                self._require_items(output_dict["hypotheses_generated"], "hypotheses_generated")
+                
+                # Skips re-validation when the LLM output already fits the schema
+                hypotheses = construct_trusted_many(
+                    Hypothesis, output_dict["hypotheses_generated"], strict=self.strict_validation
+                )
+                reasoning = output_dict["reasoning"]
+                confidence = output_dict.get("confidence_in_hypotheses", 0.7)
+            
+            insight_output = construct_trusted(InsightAgentOutput, {
+                "hypotheses_generated": hypotheses,
+                "data_summary_used": data_summary,
+                "reasoning": reasoning,
+                "confidence_in_hypotheses": confidence
+            }, strict=self.strict_validation)
             
-            insight_output = InsightAgentOutput(
-                hypotheses_generated=hypotheses,
-                data_summary_used=data_summary,
-                reasoning=output_dict["reasoning"],
-                confidence_in_hypotheses=output_dict.get("confidence_in_hypotheses", 0.7)
+            # ConfidenceLevel() accepts both stored values and enum members
+            avg_confidence = fmean(
+                _CONFIDENCE_WEIGHTS[ConfidenceLevel(h.confidence)] for h in hypotheses
             )
             
             self._log_event("hypothesis_generation_success", {
                 "num_hypotheses": len(hypotheses),
-                "avg_confidence": sum(
-                    1.0 if h.confidence == "high" else 0.5 if h.confidence == "medium" else 0.2
-                    for h in hypotheses
-                ) / len(hypotheses)
+                "avg_confidence": avg_confidence
             })
             
             return insight_output
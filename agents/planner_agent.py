@@ -3,13 +3,66 @@
 from typing import Dict, Any
 from agents.base_agent import BaseAgent
 from prompts.planner_prompts import PLANNER_SYSTEM_PROMPT, format_planner_prompt
-from utils.validators import TaskPlan, Task
+from utils.validators import (
+    TaskPlan, Task, PlannerResponse, construct_trusted,
+    construct_trusted_many
+)
 from pydantic import ValidationError
 
 
+def standard_task_plan(query: str) -> TaskPlan:
+    """The fixed data -> insight -> evaluator -> creative plan.
+    
+    Used instead of an LLM plan for simple lookups, which the standard
+    pipeline already covers without decomposition.
+    
+    Args:
+        query: User's analytical question
+        
+    Returns:
+        TaskPlan running every agent once, in order
+    """
+    tasks = [
+        Task(
+            task_id="task_1",
+            description="Load data and summarize key metrics",
+            assigned_agent="data_agent"
+        ),
+        Task(
+            task_id="task_2",
+            description="Generate hypotheses about the query",
+            assigned_agent="insight_agent",
+            dependencies=["task_1"]
+        ),
+        Task(
+            task_id="task_3",
+            description="Validate hypotheses",
+            assigned_agent="evaluator_agent",
+            dependencies=["task_2"]
+        ),
+        Task(
+            task_id="task_4",
+            description="Recommend creatives from validated insights",
+            assigned_agent="creative_generator",
+            dependencies=["task_3"]
+        )
+    ]
+    
+    return TaskPlan(
+        query=query,
+        tasks=tasks,
+        reasoning="Simple metric lookup; the standard pipeline answers it without planning.",
+        expected_insights=["summary metrics"]
+    )
+
+
 class PlannerAgent(BaseAgent):
     """Agent that creates strategic task plans."""
     
+    stream_item_marker = '"task_id"'
+    stream_item_model = Task
+    stream_item_list = "tasks"
+    
     def __init__(self, **kwargs):
         super().__init__(
             agent_name="PlannerAgent",
@@ -31,31 +84,50 @@ class PlannerAgent(BaseAgent):
         Returns:
             TaskPlan object with structured tasks
         """
-        self._log_event("plan_creation_start", {"query": query})
+        self._log_event("plan_creation_start", {
+            "query": query,
+            "data_context": self._log_payload(data_context)
+        })
         
         # Format the prompt
         user_prompt = format_planner_prompt(query, data_context)
         
         # Call LLM
-        response = self._call_llm(user_prompt)
-        
-        # Parse response
-        plan_dict = self._parse_json_response(response)
+        response = self._call_llm(user_prompt, query=query)
         
-        # Validate required keys
-        self._validate_output(plan_dict, ["query", "tasks", "reasoning"])
+        # Parse and validate in one pass; fall back to lenient parsing
+        # (code fences, stray text) when that fails
+        parsed = self._parse_json_typed(response, PlannerResponse)
         
-        # Convert to Pydantic model
         try:
-            # Convert task dicts to Task objects
-            tasks = [Task(**task) for task in plan_dict["tasks"]]
+            if parsed is not None:
+                self._require_items(parsed.tasks, "tasks")
+                query = parsed.query
+                tasks = parsed.tasks
+                reasoning = parsed.reasoning
+                expected_insights = parsed.expected_insights
+            else:
+                plan_dict = self._parse_json_response(response)
+                
+                # Validate required keys
+                self._validate_output(plan_dict, ["query", "tasks", "reasoning"])
+                self._require_items(plan_dict["tasks"], "tasks")
+                
+                # Convert task dicts to Task objects (skipping re-validation
+                # when the LLM output already fits the schema)
+                tasks = construct_trusted_many(
+                    Task, plan_dict["tasks"], strict=self.strict_validation
+                )
+                query = plan_dict["query"]
+                reasoning = plan_dict["reasoning"]
+                expected_insights = plan_dict.get("expected_insights", [])
             
-            task_plan = TaskPlan(
-                query=plan_dict["query"],
-                tasks=tasks,
-                reasoning=plan_dict["reasoning"],
-                expected_insights=plan_dict.get("expected_insights", [])
-            )
+            task_plan = construct_trusted(TaskPlan, {
+                "query": query,
+                "tasks": tasks,
+                "reasoning": reasoning,
+                "expected_insights": expected_insights
+            }, strict=self.strict_validation)
             
             self._log_event("plan_creation_success", {
                 "num_tasks": len(tasks),
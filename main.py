@@ -2,25 +2,59 @@
 
 import argparse
 import sys
-import json
+import time
 from pathlib import Path
-from datetime import datetime
 
-from workflows.main_workflow import AgenticOrchestrator
 from utils.logger import StructuredLogger
-from utils.llm_client import ClaudeClient
+from utils.serialization import dumps_json, write_files
 import logging
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    force=True
 )
 logger = logging.getLogger(__name__)
 
+# Insight urgency -> heading marker (red / orange circle); anything else
+# gets the yellow one. Escapes keep the source ASCII-only.
+_URGENCY_EMOJI = {"critical": "\U0001F534", "high": "\U0001F7E0"}
+_DEFAULT_URGENCY_EMOJI = "\U0001F7E1"
 
-def main():
-    """Main execution function."""
+# Per-insight section of the markdown report, filled with format_map
+_INSIGHT_SECTION = """### {i}. {emoji} {title}
+
+**Impact Score:** {impact_score}/10  
+**Urgency:** {urgency}  
+**Category:** {category}  
+
+**Description:** {description}
+
+**Validation Results:**
+- Status: {status}
+- Confidence: {confidence_score:.2f}
+- Statistical Test: {statistical_test}
+- P-value: {p_value}
+
+**Verdict:** {verdict}
+
+**Actionability:** {actionability}
+
+---
+
+"""
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line arguments.
+    
+    Args:
+        argv: Argument list (defaults to sys.argv)
+        
+    Returns:
+        Parsed arguments
+    """
     parser = argparse.ArgumentParser(
         description="Agentic Facebook Ads Analyst - Multi-agent system for ad performance analysis"
     )
@@ -47,19 +81,68 @@ def main():
         default="logs",
         help="Directory for log files"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the LLM instead of reusing cached responses from ./cache"
+    )
+    parser.add_argument(
+        "--similar-cache",
+        type=float,
+        default=None,
+        metavar="THRESHOLD",
+        help="Also reuse cached responses for near-duplicate queries at this cosine similarity (e.g. 0.95)"
+    )
+    parser.add_argument(
+        "--fast-model",
+        type=str,
+        default=None,
+        metavar="MODEL",
+        help="Cheaper model for the planning stage (default: same model as the other agents)"
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Fully re-validate every parsed LLM output (debugging)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log full agent inputs instead of hashed digests"
+    )
     
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def prepare_run(args: argparse.Namespace):
+    """Create output/log directories and pick this run's log file.
     
-    # Create output directories
+    Args:
+        args: Parsed command-line arguments
+        
+    Returns:
+        Tuple of (output_dir, log_file)
+    """
     output_dir = Path(args.output_dir)
     log_dir = Path(args.log_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-    log_dir.mkdir(parents=True, exist_ok=True)
+    for directory in (output_dir, log_dir):
+        directory.mkdir(parents=True, exist_ok=True)
     
-    # Initialize logger
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = log_dir / f"run_{timestamp}.json"
-    structured_logger = StructuredLogger(log_file=str(log_file))
+    log_file = log_dir / f"run_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    return output_dir, log_file
+
+
+def main():
+    """Main execution function."""
+    args = parse_args()
+    
+    # Imported after argument parsing so --help skips pandas/openai startup
+    from workflows.main_workflow import AgenticOrchestrator
+    from utils.llm_client import LLMClient, get_default_client
+    from utils.llm_cache import LLMCache
+    
+    output_dir, log_file = prepare_run(args)
+    structured_logger = StructuredLogger(log_file=str(log_file), verbose=args.verbose)
     
     logger.info("=" * 60)
     logger.info("KASPARRO AGENTIC FACEBOOK ADS ANALYST")
@@ -72,9 +155,12 @@ def main():
     try:
         # Initialize orchestrator
         orchestrator = AgenticOrchestrator(
-            llm_client=ClaudeClient(),
+            llm_client=get_default_client(),
             structured_logger=structured_logger,
-            max_replans=2
+            max_replans=2,
+            llm_cache=None if args.no_cache else LLMCache(similarity_threshold=args.similar_cache or None),
+            strict_validation=args.strict,
+            fast_llm_client=LLMClient(model=args.fast_model) if args.fast_model else None
         )
         
         # Execute workflow
@@ -87,43 +173,24 @@ def main():
         # Save outputs
         logger.info("Saving outputs...")
         
-        # Save insights as JSON
+        # Serialize everything first, then write all files concurrently
         insights_file = output_dir / "insights.json"
-        with open(insights_file, 'w') as f:
-            json.dump(
-                [insight.model_dump() for insight in final_report.key_insights],
-                f,
-                indent=2,
-                default=str
-            )
-        logger.info(f"Insights saved to: {insights_file}")
-        
-        # Save creative recommendations as JSON
         creatives_file = output_dir / "creatives.json"
-        with open(creatives_file, 'w') as f:
-            json.dump(
-                [rec.model_dump() for rec in final_report.creative_recommendations],
-                f,
-                indent=2,
-                default=str
-            )
-        logger.info(f"Creative recommendations saved to: {creatives_file}")
-        
-        # Save full report as JSON
         report_json_file = output_dir / "report_full.json"
-        with open(report_json_file, 'w') as f:
-            json.dump(final_report.model_dump(), f, indent=2, default=str)
-        logger.info(f"Full report saved to: {report_json_file}")
-        
-        # Generate markdown report
         report_md_file = output_dir / "report.md"
-        markdown_report = generate_markdown_report(final_report)
-        with open(report_md_file, 'w') as f:
-            f.write(markdown_report)
-        logger.info(f"Markdown report saved to: {report_md_file}")
         
-        # Save logs
-        structured_logger.save_logs(str(log_file))
+        write_files({
+            insights_file: dumps_json([insight.dumped for insight in final_report.key_insights]),
+            creatives_file: dumps_json([rec.model_dump() for rec in final_report.creative_recommendations]),
+            report_json_file: dumps_json(final_report.model_dump()),
+            report_md_file: generate_markdown_report(final_report).encode("utf-8")
+        })
+        
+        logger.info(f"Insights saved to: {insights_file}")
+        logger.info(f"Creative recommendations saved to: {creatives_file}")
+        logger.info(f"Full report saved to: {report_json_file}")
+        logger.info(f"Markdown report saved to: {report_md_file}")
+        logger.info(f"Logs saved to: {log_file}")
         
         logger.info("=" * 60)
         logger.info("WORKFLOW COMPLETED SUCCESSFULLY")
@@ -137,6 +204,9 @@ def main():
     except Exception as e:
         logger.error(f"Workflow failed: {e}", exc_info=True)
         sys.exit(1)
+    finally:
+        # Events were appended to log_file as they happened
+        structured_logger.close()
 
 
 def generate_markdown_report(report) -> str:
@@ -148,7 +218,7 @@ def generate_markdown_report(report) -> str:
     Returns:
         Markdown formatted report
     """
-    md = f"""# Facebook Ads Performance Analysis Report
+    parts = [f"""# Facebook Ads Performance Analysis Report
 
 **Generated:** {report.generated_at.strftime('%Y-%m-%d %H:%M:%S')}  
 **Report ID:** {report.report_id}  
@@ -171,39 +241,32 @@ def generate_markdown_report(report) -> str:
 
 ## Key Insights ({len(report.key_insights)})
 
-"""
+"""]
     
     for i, insight in enumerate(report.key_insights, 1):
-        urgency_emoji = "🔴" if insight.urgency == "critical" else "🟠" if insight.urgency == "high" else "🟡"
-        
-        md += f"""### {i}. {urgency_emoji} {insight.title}
-
-**Impact Score:** {insight.impact_score}/10  
-**Urgency:** {insight.urgency.upper()}  
-**Category:** {insight.category}  
-
-**Description:** {insight.description}
-
-**Validation Results:**
-- Status: {insight.validation.status}
-- Confidence: {insight.validation.confidence_score:.2f}
-- Statistical Test: {insight.validation.statistical_test or 'N/A'}
-- P-value: {insight.validation.p_value or 'N/A'}
-
-**Verdict:** {insight.validation.verdict}
-
-**Actionability:** {insight.validation.actionability}
-
----
-
-"""
+        validation = insight.validation
+        parts.append(_INSIGHT_SECTION.format_map({
+            "i": i,
+            "emoji": _URGENCY_EMOJI.get(insight.urgency, _DEFAULT_URGENCY_EMOJI),
+            "title": insight.title,
+            "impact_score": insight.impact_score,
+            "urgency": insight.urgency.upper(),
+            "category": insight.category,
+            "description": insight.description,
+            "status": validation.status,
+            "confidence_score": validation.confidence_score,
+            "statistical_test": validation.statistical_test or 'N/A',
+            "p_value": validation.p_value or 'N/A',
+            "verdict": validation.verdict,
+            "actionability": validation.actionability
+        }))
     
-    md += f"""## Creative Recommendations ({len(report.creative_recommendations)})
+    parts.append(f"""## Creative Recommendations ({len(report.creative_recommendations)})
 
-"""
+""")
     
     for i, rec in enumerate(report.creative_recommendations, 1):
-        md += f"""### {i}. {rec.action}
+        parts.append(f"""### {i}. {rec.action}
 
 **Type:** {rec.recommendation_type}  
 **Priority Score:** {rec.priority_score}/10  
@@ -213,16 +276,16 @@ def generate_markdown_report(report) -> str:
 **Data-Driven Rationale:** {rec.data_driven_rationale}
 
 **Expected Improvements:**
-"""
+""")
         for metric, value in rec.expected_improvement.items():
-            md += f"- {metric}: +{value}\n"
+            parts.append(f"- {metric}: +{value}\n")
         
         if rec.estimated_budget_allocation:
-            md += f"\n**Budget Allocation:** ${rec.estimated_budget_allocation:,.2f}\n"
+            parts.append(f"\n**Budget Allocation:** ${rec.estimated_budget_allocation:,.2f}\n")
         
-        md += "\n---\n\n"
+        parts.append("\n---\n\n")
     
-    md += """## Methodology
+    parts.append("""## Methodology
 
 This analysis was conducted using a multi-agent system with the following workflow:
 
@@ -233,9 +296,9 @@ This analysis was conducted using a multi-agent system with the following workfl
 5. **Creative Generator Agent**: Produced data-driven creative recommendations
 
 All insights are backed by quantitative evidence with statistical significance testing (p < 0.05) and practical significance (effect size > 0.3).
-"""
+""")
     
-    return md
+    return "".join(parts)
 
 
 if __name__ == "__main__":
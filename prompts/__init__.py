@@ -0,0 +1,7 @@
+"""Prompt templates for each agent.
+
+Every user template puts its fixed instructions first and per-run values
+after them, with the most variable part (usually the query) last, and
+embedded JSON is dumped compact with sorted keys. Repeated runs then
+share the longest possible prompt prefix for the provider's prompt cache.
+"""
@@ -1,5 +1,7 @@
 """Prompts for the Creative Generator Agent."""
 
+from utils.serialization import dumps_prompt_json
+
 CREATIVE_GENERATOR_SYSTEM_PROMPT = """You are a Creative Generator Agent specialized in producing data-driven creative recommendations for Facebook Ads. You combine marketing creativity with analytical rigor.
 
 ## Your Mission:
@@ -147,20 +149,7 @@ Return JSON following CreativeAnalysis schema:
 - Suggest what to test instead
 """
 
-CREATIVE_GENERATOR_USER_TEMPLATE = """Generate creative recommendations based on these validated insights:
-
-**Validated Insights:**
-{validated_insights}
-
-**Performance Data Summary:**
-{performance_summary}
-
-**Creative Performance Breakdown:**
-{creative_breakdown}
-
-**Current Budget Allocation:**
-Total Spend: ${total_spend:,.2f}
-By Creative Type: {budget_by_creative}
+CREATIVE_GENERATOR_USER_TEMPLATE = """Generate creative recommendations from the validated insights and performance data below.
 
 **Instructions:**
 1. Analyze patterns in top and bottom performing creatives
@@ -175,6 +164,19 @@ By Creative Type: {budget_by_creative}
 **Focus:** Generate recommendations that can be implemented THIS WEEK and will move key metrics (ROAS, CTR, purchases).
 
 **Output:** Comprehensive CreativeAnalysis JSON object with all recommendations.
+
+**Performance Data Summary:**
+{performance_summary}
+
+**Creative Performance Breakdown:**
+{creative_breakdown}
+
+**Current Budget Allocation:**
+Total Spend: ${total_spend:,.2f}
+By Creative Type: {budget_by_creative}
+
+**Validated Insights:**
+{validated_insights}
 """
 
 def format_creative_generator_prompt(
@@ -183,13 +185,18 @@ def format_creative_generator_prompt(
     creative_breakdown: dict,
     budget_info: dict
 ) -> str:
-    """Format creative generator prompt."""
-    import json
+    """Format creative generator prompt.
     
+    Args:
+        validated_insights: Dumped validated insights
+        performance_summary: Overall performance metrics
+        creative_breakdown: Performance by creative type
+        budget_info: Total spend and spend by creative type
+    """
     return CREATIVE_GENERATOR_USER_TEMPLATE.format(
-        validated_insights=json.dumps(validated_insights, indent=2),
-        performance_summary=json.dumps(performance_summary, indent=2),
-        creative_breakdown=json.dumps(creative_breakdown, indent=2),
+        performance_summary=dumps_prompt_json(performance_summary),
+        creative_breakdown=dumps_prompt_json(creative_breakdown),
         total_spend=budget_info.get('total_spend', 0),
-        budget_by_creative=json.dumps(budget_info.get('by_creative_type', {}), indent=2)
+        budget_by_creative=dumps_prompt_json(budget_info.get('by_creative_type', {})),
+        validated_insights=dumps_prompt_json(validated_insights)
     )
@@ -1,5 +1,7 @@
 """Prompts for the Evaluator Agent."""
 
+from utils.serialization import dumps_prompt_json
+
 EVALUATOR_AGENT_SYSTEM_PROMPT = """You are an Evaluator Agent specialized in validating hypotheses with quantitative rigor. You think like a statistician and apply scientific skepticism.
 
 ## Your Mission:
@@ -106,20 +108,7 @@ Set `needs_replan: true` if:
 **Actionability:** "Increase Image creative budget allocation by 20% on Facebook. Test 3 new Image variations with top-performing messaging patterns."
 """
 
-EVALUATOR_AGENT_USER_TEMPLATE = """Validate these hypotheses with statistical rigor:
-
-**Hypotheses to Evaluate:**
-{hypotheses}
-
-**Full Dataset Access:** 
-File: {data_file_path}
-You have pandas access to run statistical tests.
-
-**Validation Standards:**
-- Minimum p-value: 0.05
-- Minimum effect size: 0.3
-- Minimum sample size: 30 per segment
-- Confidence threshold: {confidence_threshold}
+EVALUATOR_AGENT_USER_TEMPLATE = """Validate the hypotheses below with statistical rigor.
 
 **Instructions:**
 1. For EACH hypothesis, run appropriate statistical tests
@@ -131,6 +120,19 @@ You have pandas access to run statistical tests.
 **Critical:** Be scientifically skeptical. Only validate hypotheses with strong quantitative evidence.
 
 **Feedback:** If most hypotheses are rejected, set needs_replan=true and explain what analysis direction might work better.
+
+**Validation Standards:**
+- Minimum p-value: 0.05
+- Minimum effect size: 0.3
+- Minimum sample size: 30 per segment
+- Confidence threshold: {confidence_threshold}
+
+**Full Dataset Access:** 
+File: {data_file_path}
+You have pandas access to run statistical tests.
+
+**Hypotheses to Evaluate:**
+{hypotheses}
 """
 
 def format_evaluator_prompt(
@@ -138,10 +140,14 @@ def format_evaluator_prompt(
     data_file_path: str,
     confidence_threshold: float = 0.7
 ) -> str:
-    """Format evaluator agent prompt."""
-    import json
+    """Format evaluator agent prompt.
     
-    hypotheses_str = json.dumps(hypotheses, indent=2)
+    Args:
+        hypotheses: Dumped hypotheses to validate
+        data_file_path: Path to data file
+        confidence_threshold: Minimum confidence to validate
+    """
+    hypotheses_str = dumps_prompt_json(hypotheses)
     
     return EVALUATOR_AGENT_USER_TEMPLATE.format(
         hypotheses=hypotheses_str,
@@ -1,5 +1,9 @@
 """Prompts for the Insight Agent."""
 
+from typing import Optional
+
+from utils.serialization import dumps_prompt_json
+
 INSIGHT_AGENT_SYSTEM_PROMPT = """You are an Insight Agent specialized in generating testable hypotheses about Facebook Ads performance. You think like a data scientist and digital marketing analyst combined.
 
 ## Your Role:
@@ -66,32 +70,47 @@ Return JSON following the InsightAgentOutput schema:
 - **Low (0.0-0.49)**: Speculative, requires more data, multiple confounding factors
 """
 
-INSIGHT_AGENT_USER_TEMPLATE = """Generate testable hypotheses to answer this question:
-
-**User Query:** {query}
-
-**Data Summary:**
-{data_summary}
+INSIGHT_AGENT_USER_TEMPLATE = """Generate testable hypotheses to answer the question below.
 
 **Instructions:**
 1. Generate 3-5 hypotheses that could explain the patterns in this data
-2. Focus on {focus_dimension} if relevant to the query
+2. Focus on the focus dimension below if relevant to the query
 3. Prioritize actionable insights over purely descriptive observations
 4. Consider both immediate causes and deeper root causes
 5. Think about what the Evaluator Agent will need to validate each hypothesis
 
 Remember: Quality over quantity. Each hypothesis should be worth the Evaluator's time to test.
+
+**Data Summary:**
+{data_summary}
+
+**Focus Dimension:** {focus_dimension}
+
+**Feedback on Previous Attempts:** {feedback}
+
+**User Query:** {query}
 """
 
-def format_insight_agent_prompt(query: str, data_summary: dict, focus_dimension: str = "all dimensions") -> str:
-    """Format insight agent prompt."""
-    import json
+def format_insight_agent_prompt(
+    query: str,
+    data_summary: dict,
+    focus_dimension: str = "all dimensions",
+    feedback: Optional[str] = None
+) -> str:
+    """Format insight agent prompt.
     
-    # Format data summary for readability
-    summary_str = json.dumps(data_summary, indent=2)
+    Args:
+        query: User's question
+        data_summary: Dumped DataSummary
+        focus_dimension: Dimension to focus on
+        feedback: Evaluator feedback on earlier attempts, when replanning
+    """
+    # Compact, key-sorted JSON for the data summary
+    summary_str = dumps_prompt_json(data_summary)
     
     return INSIGHT_AGENT_USER_TEMPLATE.format(
         query=query,
         data_summary=summary_str,
-        focus_dimension=focus_dimension
+        focus_dimension=focus_dimension,
+        feedback=feedback or "None (first attempt)"
     )
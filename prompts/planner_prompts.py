@@ -1,5 +1,8 @@
 """Prompts for the Planner Agent."""
 
+import functools
+import time
+
 PLANNER_SYSTEM_PROMPT = """You are a strategic Planner Agent for Facebook Ads analysis. Your role is to decompose user queries into a structured task plan that other specialized agents will execute.
 
 ## Your Responsibilities:
@@ -51,28 +54,36 @@ Tasks:
 4. creative_generator: Recommend fixes if creative issues found (depends on task 3)
 """
 
-PLANNER_USER_TEMPLATE = """Analyze this query and create a task plan:
+PLANNER_USER_TEMPLATE = """Analyze the query below and create a comprehensive task plan that will thoroughly answer the user's question.
 
-**User Query:** {query}
-
-**Current Date:** {current_date}
+**Available Dimensions:** creative_type, platform, country, campaign_name, adset_name
 
 **Dataset Context:** 
 - Date Range: {date_range}
 - Total Spend: ${total_spend:,.2f}
 - Overall ROAS: {overall_roas}
-- Available Dimensions: creative_type, platform, country, campaign_name, adset_name
 
-Create a comprehensive task plan that will thoroughly answer the user's question.
+**Current Date:** {current_date}
+
+**User Query:** {query}
 """
 
+@functools.lru_cache(maxsize=1)
+def _current_date(minute: int) -> str:
+    """Today's date as YYYY-MM-DD, formatted at most once per minute."""
+    return time.strftime("%Y-%m-%d")
+
+
 def format_planner_prompt(query: str, data_context: dict) -> str:
-    """Format the planner prompt with context."""
-    from datetime import datetime
+    """Format the planner prompt with context.
     
+    Args:
+        query: User's analytical question
+        data_context: Date range, total spend and overall ROAS
+    """
     return PLANNER_USER_TEMPLATE.format(
         query=query,
-        current_date=datetime.now().strftime("%Y-%m-%d"),
+        current_date=_current_date(int(time.time() // 60)),
         date_range=f"{data_context.get('start_date', 'N/A')} to {data_context.get('end_date', 'N/A')}",
         total_spend=data_context.get('total_spend', 0),
         overall_roas=data_context.get('overall_roas', 0)
@@ -0,0 +1,42 @@
+"""Test Creative Generator Agent."""
+
+import json
+
+from agents.base_agent import _StreamMonitor
+from agents.creative_generator import CreativeGeneratorAgent
+
+
+def test_prompt_shaped_creative_response_streams_cleanly():
+    """Test that creative lists outside "recommendations" are not validated as recommendations."""
+    response = json.dumps({
+        "analysis_date": "2025-01-15T10:30:00",
+        "top_performing_creatives": [
+            {"creative_id": "ad_1", "creative_type": "Image", "platform": "Facebook", "roas": 7.8}
+        ],
+        "underperforming_creatives": [],
+        "winning_patterns": ["Benefit-focused messaging wins"],
+        "losing_patterns": [],
+        "recommendations": [{
+            "recommendation_id": "rec_001",
+            "recommendation_type": "scale_creative",
+            "action": "Increase budget for Image creatives on Facebook",
+            "creative_type": "Image",
+            "target_platform": "Facebook",
+            "data_driven_rationale": "Image ROAS 6.1 vs 5.4 for Video",
+            "expected_improvement": {"roas": 0.7},
+            "implementation_details": {"platforms": ["Facebook Feed"]},
+            "priority_score": 8.5
+        }]
+    }, indent=2)
+    
+    agent = CreativeGeneratorAgent.__new__(CreativeGeneratorAgent)
+    agent.strict_validation = False
+    agent._log_event = lambda *args, **kwargs: None
+    monitor = _StreamMonitor(
+        agent, agent.stream_item_marker, agent.stream_item_model, agent.stream_item_list
+    )
+    
+    for i in range(0, len(response), 7):
+        monitor(response[i:i + 7])
+    
+    assert monitor.items_seen == 1
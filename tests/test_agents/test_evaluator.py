@@ -0,0 +1,34 @@
+"""Test Evaluator Agent."""
+
+import numpy as np
+import pandas as pd
+
+from agents.evaluator_agent import EvaluatorAgent
+from utils.validators import Hypothesis
+
+
+def _hypothesis(hypothesis_id, metric):
+    return Hypothesis(
+        hypothesis_id=hypothesis_id,
+        statement="s",
+        rationale="r",
+        metric_to_test=metric,
+        expected_direction="change",
+        segment_dimension="platform",
+        segment_value="Facebook",
+        confidence="medium"
+    )
+
+
+def test_non_numeric_metric_fails_only_its_own_hypothesis():
+    """Test that a text column named as metric does not sink the other hypotheses."""
+    df = pd.DataFrame({
+        'roas': np.linspace(1.0, 5.0, 80),
+        'platform': pd.Categorical(['Facebook', 'Instagram'] * 40)
+    })
+    agent = EvaluatorAgent.__new__(EvaluatorAgent)
+    
+    group_stats = agent._compute_group_stats([_hypothesis("h1", "platform"), _hypothesis("h2", "roas")], df)
+    
+    assert isinstance(group_stats[0], TypeError)
+    assert group_stats[1]["n_a"] == 40
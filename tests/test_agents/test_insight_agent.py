@@ -0,0 +1,66 @@
+"""Test Insight Agent."""
+
+import json
+
+from agents.base_agent import _StreamItemParser, _StreamMonitor
+from agents.insight_agent import InsightAgent
+
+
+def _feed_in_chunks(consumer, response, size=3):
+    items = []
+    for i in range(0, len(response), size):
+        items += consumer(response[i:i + size]) or []
+    return items
+
+
+def test_stream_parser_splits_items_across_chunks():
+    """Test that streamed list items are cut out whole, ignoring braces in strings."""
+    response = '{"hypotheses_generated": [{"id": "a", "note": "x}{\\"\\\\"}, {"id": "b"}], "reasoning": "{r}"}'
+    parser = _StreamItemParser("hypotheses_generated")
+    
+    items = _feed_in_chunks(parser.feed, response)
+    
+    assert items == ['{"id": "a", "note": "x}{\\"\\\\"}', '{"id": "b"}']
+
+
+def test_stream_parser_only_yields_items_of_the_named_list():
+    """Test that objects in other fields of the response are not treated as items."""
+    response = (
+        '{"other": [{"id": "x"}], "hypotheses_generated": [{"id": "a", "nested": {"k": [1]}}],'
+        ' "data_summary_used": {"date_range": {"start": "2025-01-01"}}, "note": "[{\\"id\\": 1}]"}'
+    )
+    parser = _StreamItemParser("hypotheses_generated")
+    
+    assert _feed_in_chunks(parser.feed, response, size=5) == ['{"id": "a", "nested": {"k": [1]}}']
+
+
+def test_prompt_shaped_insight_response_streams_cleanly():
+    """Test that a full response in the prompt's schema passes the stream monitor."""
+    hypothesis = {
+        "hypothesis_id": "hyp_001",
+        "statement": "Video ads have higher ROAS",
+        "rationale": "Video drives engagement",
+        "metric_to_test": "roas",
+        "expected_direction": "increase",
+        "segment_dimension": "creative_type",
+        "segment_value": "Video",
+        "confidence": "high",
+        "supporting_evidence": ["ROAS 5.2 vs 4.1"]
+    }
+    response = json.dumps({
+        "hypotheses_generated": [hypothesis, dict(hypothesis, hypothesis_id="hyp_002")],
+        "data_summary_used": {"total_spend": 100.0, "date_range": {"start": "2025-01-01", "end": "2025-01-31"}},
+        "reasoning": "Creative type explains most variance",
+        "confidence_in_hypotheses": 0.8
+    }, indent=2)
+    
+    agent = InsightAgent.__new__(InsightAgent)
+    agent.strict_validation = False
+    agent._log_event = lambda *args, **kwargs: None
+    monitor = _StreamMonitor(
+        agent, agent.stream_item_marker, agent.stream_item_model, agent.stream_item_list
+    )
+    
+    _feed_in_chunks(monitor, response, size=7)
+    
+    assert monitor.items_seen == 2
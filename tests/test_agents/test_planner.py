@@ -0,0 +1,12 @@
+"""Test Planner Agent."""
+
+from agents.base_agent import _stable_prompt
+from prompts.planner_prompts import PLANNER_SYSTEM_PROMPT
+
+
+def test_system_prompt_is_shared():
+    """Test that the normalized system prompt is one shared object."""
+    first = _stable_prompt(PLANNER_SYSTEM_PROMPT)
+    
+    assert _stable_prompt(PLANNER_SYSTEM_PROMPT) is first
+    assert _stable_prompt(PLANNER_SYSTEM_PROMPT + "\n") is first
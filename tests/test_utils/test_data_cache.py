@@ -0,0 +1,67 @@
+"""Test the in-process data cache."""
+
+import os
+
+import pytest
+from utils.data_cache import (
+    load_fb_ads_data_cached, load_fb_ads_views_cached, load_metrics_cached,
+    load_performance_by_dimension_cached, clear_data_cache
+)
+
+
+CSV_HEADER = "campaign_name,date,spend,impressions,clicks,ctr,purchases,revenue,roas,creative_type,platform,country\n"
+CSV_ROW = "Launch,01/0{day}/25,100.0,1000,20,0.02,2,500.0,5.0,Image,Facebook,US\n"
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Write a small Facebook Ads CSV."""
+    path = tmp_path / "fb_ads_data.csv"
+    path.write_text(CSV_HEADER + "".join(CSV_ROW.format(day=d) for d in range(1, 4)))
+    clear_data_cache()
+    yield path
+    clear_data_cache()
+
+
+def test_repeated_load_shares_dataframe(csv_file):
+    """Test that a second load of an unchanged file is a cache hit."""
+    first = load_fb_ads_data_cached(str(csv_file))
+    second = load_fb_ads_data_cached(str(csv_file))
+    
+    assert first is second
+    assert len(first) == 3
+
+
+def test_modified_file_is_reloaded(csv_file):
+    """Test that changing the file invalidates the cached dataframe."""
+    first = load_fb_ads_data_cached(str(csv_file))
+    
+    with open(csv_file, "a") as f:
+        f.write(CSV_ROW.format(day=4))
+    stat = csv_file.stat()
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    second = load_fb_ads_data_cached(str(csv_file))
+    
+    assert second is not first
+    assert len(second) == 4
+
+
+def test_dimension_breakdown_is_computed_once(csv_file):
+    """Test that repeated breakdown requests share one aggregated result."""
+    first = load_performance_by_dimension_cached(str(csv_file), 'platform')
+    
+    assert load_performance_by_dimension_cached(str(csv_file), 'platform') is first
+    assert first.loc['Facebook', 'spend'] == 300.0
+
+
+def test_shared_results_cannot_be_modified(csv_file):
+    """Test that writes to cached data fail and metrics are handed out as copies."""
+    df = load_fb_ads_data_cached(str(csv_file))
+    with pytest.raises(ValueError):
+        df.loc[0, 'spend'] = 0.0
+    with pytest.raises(ValueError):
+        load_fb_ads_views_cached(str(csv_file)).spend[0] = 0.0
+    
+    load_metrics_cached(str(csv_file))['total_spend'] = 0.0
+    assert load_metrics_cached(str(csv_file))['total_spend'] == 300.0
@@ -0,0 +1,88 @@
+"""Test Facebook Ads data processing helpers."""
+
+import os
+
+import pandas as pd
+from utils.data_processors import (
+    load_fb_ads_data, precompute_cube, get_performance_by_dimension_cached,
+    calculate_metrics, build_fb_ads_data
+)
+
+
+def test_cube_marginals_match_direct_groupby():
+    """Test that per-dimension views from the cube match a plain groupby."""
+    df = pd.DataFrame({
+        'creative_type': ['Image', 'Video', 'Image', 'UGC'],
+        'platform': ['Facebook', 'Instagram', 'Instagram', None],
+        'spend': [100.0, 50.0, 25.0, 10.0],
+        'revenue': [400.0, 100.0, 75.0, 5.0],
+        'impressions': [1000, 800, 400, 100],
+        'clicks': [20, 10, 5, 0],
+        'purchases': [4, 1, 1, 0]
+    })
+    cube = precompute_cube(df, ('creative_type', 'platform'))
+    
+    creative = get_performance_by_dimension_cached(cube, 'creative_type')
+    assert list(creative.index) == ['Image', 'Video', 'UGC']
+    assert creative.loc['Image', 'spend'] == 125.0
+    assert creative.loc['Image', 'roas'] == 3.8
+    
+    # Rows with a missing platform still count toward their creative type
+    assert creative.loc['UGC', 'spend'] == 10.0
+    assert set(get_performance_by_dimension_cached(cube, 'platform').index) == {'Facebook', 'Instagram'}
+
+
+def test_parquet_copy_is_reused(tmp_path):
+    """Test that a second load reads the Parquet copy with the same dtypes."""
+    csv_file = tmp_path / "fb_ads_data.csv"
+    csv_file.write_text(
+        "campaign_name,date,spend,impressions,clicks,revenue,creative_type,platform,country\n"
+        "Launch,01/02/25,100.0,1000,20,500.0,Image,Facebook,US\n"
+        "Launch,01/01/25,50.0,500,0,100.0,Video,Instagram,US\n"
+    )
+    
+    first = load_fb_ads_data(str(csv_file))
+    assert (tmp_path / "fb_ads_data.parquet").exists()
+    
+    second = load_fb_ads_data(str(csv_file))
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_replaced_csv_with_same_mtime_is_reparsed(tmp_path):
+    """Test that the Parquet copy is not reused for a different CSV with the same mtime."""
+    csv_file = tmp_path / "fb_ads_data.csv"
+    header = "campaign_name,date,spend,impressions,clicks,revenue,creative_type,platform,country\n"
+    row = "Launch,01/0{day}/25,100.0,1000,20,500.0,Image,Facebook,US\n"
+    csv_file.write_text(header + row.format(day=1) + row.format(day=2))
+    assert len(load_fb_ads_data(str(csv_file))) == 2
+    
+    # Rewrite in place but keep the timestamp, as cp -p or tar would
+    stat = csv_file.stat()
+    csv_file.write_text(header + row.format(day=1) + row.format(day=2) + row.format(day=3))
+    os.utime(csv_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    
+    assert len(load_fb_ads_data(str(csv_file))) == 3
+
+
+def test_totals_skip_missing_values():
+    """Test that a row missing metric values does not turn the totals into NaN."""
+    df = pd.DataFrame({
+        'date': pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-03']),
+        'campaign_name': ['Launch'] * 3,
+        'creative_type': ['Image', 'Video', 'Image'],
+        'spend': [100.0, float('nan'), 50.0],
+        'revenue': [400.0, 100.0, float('nan')],
+        'impressions': [1000, 800, 400],
+        'clicks': [20, 10, 5],
+        'purchases': [4, 1, 1],
+        'ctr': [0.02, float('nan'), 0.04],
+        'roas': [4.0, float('nan'), float('nan')]
+    })
+    
+    metrics = calculate_metrics(df)
+    assert metrics['total_spend'] == 150.0
+    assert metrics['total_revenue'] == 500.0
+    assert metrics['avg_ctr'] == 3.0
+    
+    data = build_fb_ads_data(df)
+    assert (data.total_spend, data.total_revenue) == (150.0, 500.0)
@@ -0,0 +1,30 @@
+"""Test hypothesis de-duplication."""
+
+from utils.dedup import dedupe_hypotheses
+from utils.validators import Hypothesis
+
+
+def _hypothesis(hypothesis_id, statement, segment_value=None):
+    return Hypothesis(
+        hypothesis_id=hypothesis_id,
+        statement=statement,
+        rationale="r",
+        metric_to_test="roas",
+        expected_direction="increase",
+        segment_dimension="creative_type" if segment_value else None,
+        segment_value=segment_value,
+        confidence="medium"
+    )
+
+
+def test_reworded_hypotheses_for_the_same_test_are_dropped():
+    """Test that only the first hypothesis per (metric, segment) test is kept."""
+    hypotheses = [
+        _hypothesis("h1", "Video ads outperform", "Video"),
+        _hypothesis("h2", "Video creatives beat the rest", "Video"),
+        _hypothesis("h3", "Image ads lag", "Image"),
+        _hypothesis("h4", "ROAS is declining"),
+        _hypothesis("h5", "ROAS dropped recently")
+    ]
+    
+    assert [h.hypothesis_id for h in dedupe_hypotheses(hypotheses)] == ["h1", "h3", "h4"]
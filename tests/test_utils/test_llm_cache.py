@@ -0,0 +1,47 @@
+"""Test the persistent LLM response cache."""
+
+import pytest
+from utils.llm_cache import LLMCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Open a cache in a temporary directory."""
+    llm_cache = LLMCache(db_path=str(tmp_path / "llm_cache.sqlite"))
+    yield llm_cache
+    llm_cache.close()
+
+
+def test_normalized_prompts_share_key(cache):
+    """Test that formatting noise does not change the key."""
+    key = LLMCache.make_key("system", "user prompt\n", model="gpt-4o-mini")
+    cache.set(key, '{"ok": true}')
+    
+    assert cache.get(LLMCache.make_key("system\r\n", "  user prompt", model="gpt-4o-mini")) == '{"ok": true}'
+    assert cache.get(LLMCache.make_key("system", "user prompt", model="gpt-4o")) is None
+    assert cache.get(LLMCache.make_key(
+        "system", "user prompt", model="gpt-4o-mini", agent_name="PlannerAgent"
+    )) is None
+
+
+def test_expired_entry_is_a_miss(cache):
+    """Test that entries past their TTL are not returned."""
+    key = LLMCache.make_key("system", "user")
+    cache.set(key, "stale", ttl=-1)
+    
+    assert cache.get(key) is None
+
+
+def test_similar_query_hits_only_on_stopword_changes(tmp_path):
+    """Test that near-duplicate queries hit but changed or reordered words do not."""
+    cache = LLMCache(db_path=str(tmp_path / "llm_cache.sqlite"), similarity_threshold=0.8)
+    scope = LLMCache.make_scope("system", "Data: {...}", model="gpt-4o-mini", agent_name="InsightAgent")
+    query = "Why did CPC rise last week for Video creatives?"
+    cache.set(LLMCache.make_key("system", query), '{"ok": true}', scope=scope, query=query)
+    
+    assert cache.get_similar(scope, "why did CPC rise during the last week for video creatives") == '{"ok": true}'
+    assert cache.get_similar(scope, "Why did CPM rise last week for Video creatives?") is None
+    assert cache.get_similar(scope, "Did CPC rise this week for Video creatives?") is None
+    assert cache.get_similar(scope, "Why did Video creatives rise last week for CPC?") is None
+    assert cache.get_similar(LLMCache.make_scope("system", "Data: {changed}"), query) is None
+    cache.close()
@@ -0,0 +1,20 @@
+"""Test the structured NDJSON logger."""
+
+from utils.logger import StructuredLogger
+
+
+def test_events_are_appended_as_ndjson(tmp_path):
+    """Test that each event lands in the log file as soon as it is logged."""
+    log_file = tmp_path / "run.jsonl"
+    structured_logger = StructuredLogger(log_file=str(log_file))
+    
+    structured_logger.log_agent_execution("PlannerAgent", "plan_creation_start", {"query": "q"})
+    assert len(log_file.read_bytes().splitlines()) == 1
+    
+    structured_logger.log_agent_execution("InsightAgent", "llm_call_error", {}, status="error")
+    structured_logger.save_logs(str(log_file))
+    structured_logger.close()
+    
+    events = StructuredLogger.load_logs(str(log_file))
+    assert [e["agent"] for e in events] == ["PlannerAgent", "InsightAgent"]
+    assert events[1]["status"] == "error"
@@ -0,0 +1,11 @@
+"""Test query classification."""
+
+from utils.query_classifier import classify_query
+
+
+def test_only_plain_lookups_are_trivial():
+    """Test that lookups skip planning while why/what-to-do questions do not."""
+    assert classify_query("What was total spend last week?") == "trivial"
+    assert classify_query("Why did ROAS drop last week?") == "analytical"
+    assert classify_query("What creatives work best on Instagram?") == "analytical"
+    assert classify_query("What should I do to improve CTR?") == "strategic"
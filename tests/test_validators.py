@@ -3,8 +3,10 @@
 import pytest
 from utils.validators import (
     Hypothesis, ValidationResult, Insight, CreativeRecommendation,
-    ConfidenceLevel, HypothesisStatus, CreativeType, Platform
+    ConfidenceLevel, HypothesisStatus, CreativeType, Platform,
+    construct_trusted, construct_trusted_many
 )
+from pydantic import ValidationError
 
 
 def test_hypothesis_creation():
@@ -75,5 +77,57 @@ def test_confidence_validation():
         )
 
 
+def test_construct_trusted_falls_back_to_validation():
+    """Test that well-shaped data skips validation and bad data still fails."""
+    data = {
+        "hypothesis_id": "hyp_001",
+        "statement": "Image creatives outperform Video on Facebook",
+        "rationale": "Historical data shows higher ROAS for Image format",
+        "metric_to_test": "roas",
+        "expected_direction": "increase",
+        "confidence": "high"
+    }
+    
+    hyp = construct_trusted(Hypothesis, data)
+    assert hyp.model_dump() == Hypothesis(**data).model_dump()
+    
+    with pytest.raises(ValidationError):
+        construct_trusted(Hypothesis, {**data, "confidence": "certain"})
+
+
+def test_construct_trusted_many_matches_single():
+    """Test that batch construction agrees with construct_trusted item by item."""
+    data = {
+        "hypothesis_id": "hyp_001",
+        "statement": "Video creatives lose ROAS on Instagram",
+        "rationale": "Recent weeks show a decline",
+        "metric_to_test": "roas",
+        "expected_direction": "decrease",
+        "confidence": "medium"
+    }
+    
+    hyps = construct_trusted_many(Hypothesis, [data, {**data, "hypothesis_id": "hyp_002"}])
+    assert [h.hypothesis_id for h in hyps] == ["hyp_001", "hyp_002"]
+    assert hyps[0].model_dump() == construct_trusted(Hypothesis, data).model_dump()
+    
+    with pytest.raises(ValidationError):
+        construct_trusted_many(Hypothesis, [data, {**data, "expected_direction": "sideways"}])
+
+
+def test_hypothesis_is_frozen():
+    """Test that agent output models cannot be mutated in place."""
+    hyp = Hypothesis(
+        hypothesis_id="hyp_001",
+        statement="Image creatives outperform Video on Facebook",
+        rationale="Historical data shows higher ROAS for Image format",
+        metric_to_test="roas",
+        expected_direction="increase",
+        confidence="high"
+    )
+    
+    with pytest.raises(ValidationError):
+        hyp.confidence = "low"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
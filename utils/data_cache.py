@@ -0,0 +1,177 @@
+"""In-process cache for loaded Facebook Ads data."""
+
+import copy
+import dataclasses
+import functools
+from pathlib import Path
+from typing import Any, Dict
+import logging
+
+import numpy as np
+import pandas as pd
+
+from utils.data_processors import (
+    FBAdsData,
+    build_fb_ads_data,
+    calculate_metrics,
+    get_performance_by_dimension_cached,
+    load_fb_ads_data,
+    precompute_cube
+)
+
+logger = logging.getLogger(__name__)
+
+# Dimensions aggregated together in the cached cube; any of them can be
+# requested from load_performance_by_dimension_cached
+CUBE_DIMENSIONS = ('creative_type', 'platform', 'country')
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    """Mark a shared array read-only, so writes fail instead of leaking."""
+    array.flags.writeable = False
+    return array
+
+
+def _read_only_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Rebuild df on read-only copies of its NumPy-backed columns.
+    
+    In-place writes to the values (df.loc[...] = x, df[col] *= 2) then
+    raise instead of changing the dataframe every other caller shares.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        # Extension columns (categoricals) are kept as they are
+        if isinstance(series.dtype, np.dtype):
+            columns[col] = _read_only(series.to_numpy(copy=True))
+        else:
+            columns[col] = series
+    
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """Load and cache a dataframe for one version of a file.
+    
+    mtime_ns and size are only part of the cache key, so an edited file
+    gets a fresh entry instead of a stale dataframe.
+    """
+    logger.info("Data cache miss for %s", path)
+    return _read_only_frame(load_fb_ads_data(path))
+
+
+@functools.lru_cache(maxsize=8)
+def _build_cached(path: str, mtime_ns: int, size: int) -> FBAdsData:
+    """Build and cache column views for one version of a file."""
+    data = build_fb_ads_data(_load_cached(path, mtime_ns, size))
+    for field in dataclasses.fields(data):
+        value = getattr(data, field.name)
+        if isinstance(value, np.ndarray):
+            _read_only(value)
+    
+    return data
+
+
+@functools.lru_cache(maxsize=8)
+def _metrics_cached(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Compute and cache overall metrics for one version of a file."""
+    return calculate_metrics(_load_cached(path, mtime_ns, size))
+
+
+@functools.lru_cache(maxsize=8)
+def _cube_cached(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    """Aggregate and cache the metric cube for one version of a file."""
+    return precompute_cube(_load_cached(path, mtime_ns, size), CUBE_DIMENSIONS)
+
+
+@functools.lru_cache(maxsize=32)
+def _performance_cached(path: str, mtime_ns: int, size: int, dimension: str) -> pd.DataFrame:
+    """Aggregate and cache one dimension's performance for one version of a file."""
+    return _read_only_frame(
+        get_performance_by_dimension_cached(_cube_cached(path, mtime_ns, size), dimension)
+    )
+
+
+def _cache_key(file_path: str):
+    """Return the (absolute path, mtime, size) key for a data file."""
+    path = Path(file_path).resolve()
+    stat = path.stat()
+    
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def load_fb_ads_data_cached(file_path: str = "data/raw/fb_ads_data.csv") -> pd.DataFrame:
+    """Load Facebook Ads data, reusing a previous parse of the same file.
+    
+    The returned dataframe is shared between all callers. Its numeric
+    columns are read-only, so writing to them raises; copy it before
+    adding columns or changing values.
+    
+    Args:
+        file_path: Path to CSV file
+    
+    Returns:
+        Cleaned pandas DataFrame (shared, do not mutate)
+    """
+    return _load_cached(*_cache_key(file_path))
+
+
+def load_fb_ads_views_cached(file_path: str = "data/raw/fb_ads_data.csv") -> FBAdsData:
+    """Load Facebook Ads data with precomputed column arrays and totals.
+    
+    Shares the dataframe returned by load_fb_ads_data_cached; the same
+    read-only contract applies to it, and its arrays are read-only.
+    
+    Args:
+        file_path: Path to CSV file
+    
+    Returns:
+        FBAdsData for the file (shared, do not mutate)
+    """
+    return _build_cached(*_cache_key(file_path))
+
+
+def load_metrics_cached(file_path: str = "data/raw/fb_ads_data.csv") -> Dict[str, Any]:
+    """Overall metrics (calculate_metrics) for a data file, computed once.
+    
+    Args:
+        file_path: Path to CSV file
+    
+    Returns:
+        Metrics dictionary (a copy; safe to modify)
+    """
+    return copy.deepcopy(_metrics_cached(*_cache_key(file_path)))
+
+
+def load_performance_by_dimension_cached(
+    file_path: str,
+    dimension: str
+) -> pd.DataFrame:
+    """Performance aggregated by one dimension, computed once per file version.
+    
+    All dimensions in CUBE_DIMENSIONS are marginalized from one shared
+    cube, so every agent asking for the same breakdown in a run (or in a
+    replan) reuses the same result.
+    
+    Args:
+        file_path: Path to CSV file
+        dimension: One of CUBE_DIMENSIONS
+    
+    Returns:
+        Aggregated dataframe sorted by revenue descending (shared, with
+        read-only values; copy it before modifying)
+    """
+    if dimension not in CUBE_DIMENSIONS:
+        raise ValueError(f"Unknown dimension {dimension!r}; expected one of {CUBE_DIMENSIONS}")
+    
+    return _performance_cached(*_cache_key(file_path), dimension)
+
+
+def clear_data_cache():
+    """Drop all cached dataframes."""
+    _performance_cached.cache_clear()
+    _cube_cached.cache_clear()
+    _metrics_cached.cache_clear()
+    _build_cached.cache_clear()
+    _load_cached.cache_clear()
@@ -1,48 +1,245 @@
 """Data processing utilities for Facebook Ads data."""
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas.tseries.api import guess_datetime_format
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Tuple
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
+# Columns read from the CSV; anything else in a wide export is skipped
+FB_ADS_COLUMNS = (
+    'campaign_name', 'adset_name', 'date', 'spend', 'impressions', 'clicks',
+    'ctr', 'cpc', 'purchases', 'revenue', 'roas', 'creative_type',
+    'creative_message', 'audience_type', 'platform', 'country'
+)
 
-def load_fb_ads_data(file_path: str = "data/raw/fb_ads_data.csv") -> pd.DataFrame:
+# Low-cardinality string columns, stored as categoricals (integer codes)
+CATEGORICAL_COLUMNS = (
+    'campaign_name', 'adset_name', 'creative_type', 'audience_type', 'platform', 'country'
+)
+
+# Metric columns parsed as float64 whatever their values look like
+FLOAT_COLUMNS = ('spend', 'ctr', 'cpc', 'revenue', 'roas')
+
+# Additive metric columns, in the order calculate_metrics unpacks them
+_SUM_COLUMNS = ('spend', 'revenue', 'impressions', 'clicks', 'purchases')
+
+
+def _parse_dates(dates: pd.Series) -> pd.Series:
+    """Convert the date column to datetime64.
+    
+    The format is guessed once from the first value and applied to the
+    whole column in one vectorized pass; files whose format cannot be
+    guessed, or that mix several formats, fall back to per-value parsing.
+    """
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    
+    first = dates.dropna()
+    fmt = guess_datetime_format(str(first.iloc[0]), dayfirst=False) if len(first) else None
+    if fmt is not None:
+        try:
+            return pd.to_datetime(dates, format=fmt)
+        except ValueError:
+            pass
+    
+    return pd.to_datetime(dates, format='mixed', dayfirst=False)
+
+
+# Bump whenever load_fb_ads_data cleans the data differently, so Parquet
+# copies written by older code are not reused
+_SIDECAR_VERSION = 1
+
+# Parquet schema metadata key recording which CSV a copy was built from
+_SIDECAR_SOURCE_KEY = b'fb_ads_source'
+
+
+def _sidecar_path(file_path: str) -> Path:
+    """Parquet file caching the cleaned dataframe parsed from file_path."""
+    return Path(file_path).with_suffix('.parquet')
+
+
+def _source_signature(stat: os.stat_result) -> bytes:
+    """Identify one version of the CSV and of the loader that cleaned it."""
+    return f"{stat.st_mtime_ns}:{stat.st_size}:{_SIDECAR_VERSION}".encode()
+
+
+def _read_sidecar(file_path: str, source: bytes):
+    """Return the cached dataframe for file_path, or None if missing or stale.
+    
+    The copy is only used if it was built from exactly this CSV version
+    (same mtime and size) by this loader version; comparing mtimes alone
+    would accept a replaced CSV that kept its timestamp.
+    """
+    sidecar = _sidecar_path(file_path)
+    try:
+        # The footer alone says which CSV the copy was built from
+        metadata = pq.read_schema(sidecar).metadata or {}
+        if metadata.get(_SIDECAR_SOURCE_KEY) != source:
+            return None
+        # Map the file instead of reading it into an intermediate buffer
+        return pd.read_parquet(sidecar, engine='pyarrow', memory_map=True)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable data cache %s: %s", sidecar, e)
+        return None
+
+
+def _write_sidecar(file_path: str, df: pd.DataFrame, source: bytes):
+    """Cache the cleaned dataframe next to file_path (best effort)."""
+    sidecar = _sidecar_path(file_path)
+    tmp_path = sidecar.with_name(f".{sidecar.name}.{os.getpid()}.tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}), _SIDECAR_SOURCE_KEY: source
+        })
+        pq.write_table(table, tmp_path, compression='snappy')
+        # Atomic rename, so concurrent runs never read a half-written file
+        os.replace(tmp_path, sidecar)
+    except Exception as e:
+        logger.warning("Could not write data cache %s: %s", sidecar, e)
+        tmp_path.unlink(missing_ok=True)
+
+
+def load_fb_ads_data(
+    file_path: str = "data/raw/fb_ads_data.csv",
+    use_parquet_cache: bool = True
+) -> pd.DataFrame:
     """Load Facebook Ads data from CSV.
     
+    The cleaned dataframe is also saved as a Parquet file next to the CSV
+    (same name, .parquet suffix). Later loads read that instead of parsing
+    the CSV again, as long as the CSV's mtime and size are unchanged; it
+    keeps the datetime and categorical dtypes, so no conversion is
+    repeated.
+    
     Args:
         file_path: Path to CSV file
+        use_parquet_cache: Read and write the Parquet copy
         
     Returns:
         Cleaned pandas DataFrame
     """
+    use_parquet_cache = use_parquet_cache and _sidecar_path(file_path) != Path(file_path)
+    if use_parquet_cache:
+        # Taken before parsing, so a CSV rewritten mid-parse is not marked fresh
+        source = _source_signature(os.stat(file_path))
+        df = _read_sidecar(file_path, source)
+        if df is not None:
+            logger.info("Loaded %d rows from %s", len(df), _sidecar_path(file_path))
+            return df
+    
     try:
-        df = pd.read_csv(file_path)
+        # Project to known columns (header names may carry whitespace)
+        header = pd.read_csv(file_path, nrows=0).columns
+        usecols = [col for col in header if col.strip() in FB_ADS_COLUMNS]
+        dtype = {}
+        for col in usecols:
+            if col.strip() in CATEGORICAL_COLUMNS:
+                dtype[col] = 'category'
+            elif col.strip() in FLOAT_COLUMNS:
+                dtype[col] = 'float64'
+        
+        # PyArrow's multithreaded parser is much faster than the C engine;
+        # the explicit schema skips type inference for known columns and
+        # decodes grouping columns straight to categoricals
+        df = pd.read_csv(file_path, engine='pyarrow', usecols=usecols, dtype=dtype)
         
         # Clean column names (strip whitespace)
         df.columns = df.columns.str.strip()
         
-        # Convert date to datetime - use mixed format to handle variations
-        df['date'] = pd.to_datetime(df['date'], format='mixed', dayfirst=False)
+        df['date'] = _parse_dates(df['date'])
         
-        # Sort by date
-        df = df.sort_values('date').reset_index(drop=True)
+        # Sort by date (stable, so rows on the same date keep file order)
+        df = df.sort_values('date', kind='stable', ignore_index=True)
         
         # Calculate derived metrics if not present
         if 'cpc' not in df.columns:
-            df['cpc'] = df['spend'] / df['clicks'].replace(0, 1)  # Avoid division by zero
+            # Rows without clicks keep cpc = spend, as dividing by 1 did
+            spend = df['spend'].to_numpy(dtype=np.float64)
+            clicks = df['clicks'].to_numpy()
+            df['cpc'] = np.divide(spend, clicks, out=spend.copy(), where=clicks != 0)
+        
+        logger.info("Loaded %d rows from %s", len(df), file_path)
+        # min/max scan the whole column, so only when the line is emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Date range: %s to %s", df['date'].min(), df['date'].max())
         
-        logger.info(f"Loaded {len(df)} rows from {file_path}")
-        logger.info(f"Date range: {df['date'].min()} to {df['date'].max()}")
+        if use_parquet_cache:
+            _write_sidecar(file_path, df, source)
         
         return df
         
     except Exception as e:
-        logger.error(f"Error loading data: {e}")
+        logger.error("Error loading data: %s", e)
         raise
 
 
+@dataclass(frozen=True, eq=False)
+class FBAdsData:
+    """Loaded dataframe plus raw column arrays and reused aggregates.
+    
+    Built once per dataset so agents can read NumPy arrays and totals
+    directly instead of re-dispatching pandas reductions on every call.
+    """
+    df: pd.DataFrame
+    spend: np.ndarray
+    revenue: np.ndarray
+    roas: np.ndarray
+    ctr: np.ndarray
+    creative_type_codes: np.ndarray
+    creative_types: np.ndarray
+    campaigns: List[str]
+    total_spend: float
+    total_revenue: float
+    num_days: int
+    start_date: str
+    end_date: str
+
+
+def build_fb_ads_data(df: pd.DataFrame) -> FBAdsData:
+    """Precompute column arrays and totals for a loaded dataframe.
+    
+    Args:
+        df: Facebook Ads dataframe from load_fb_ads_data
+        
+    Returns:
+        FBAdsData wrapping the dataframe
+    """
+    spend = df['spend'].to_numpy(dtype=np.float64)
+    revenue = df['revenue'].to_numpy(dtype=np.float64)
+    dates = df['date']
+    
+    # Codes index into uniques, which keep order of first appearance
+    creative_type_codes, creative_types = pd.factorize(df['creative_type'])
+    
+    return FBAdsData(
+        df=df,
+        spend=spend,
+        revenue=revenue,
+        roas=df['roas'].to_numpy(dtype=np.float64),
+        ctr=df['ctr'].to_numpy(dtype=np.float64),
+        creative_type_codes=creative_type_codes,
+        creative_types=np.asarray(creative_types),
+        campaigns=pd.unique(df['campaign_name']).tolist(),
+        # nansum skips missing values, as pandas .sum() does
+        total_spend=float(np.nansum(spend)),
+        total_revenue=float(np.nansum(revenue)),
+        num_days=int(dates.nunique()),
+        start_date=dates.min().strftime('%Y-%m-%d'),
+        end_date=dates.max().strftime('%Y-%m-%d')
+    )
+
+
 def calculate_metrics(df: pd.DataFrame) -> Dict[str, Any]:
     """Calculate summary metrics from dataframe.
     
@@ -52,21 +249,27 @@ def calculate_metrics(df: pd.DataFrame) -> Dict[str, Any]:
     Returns:
         Dictionary of summary metrics
     """
-    total_clicks = df['clicks'].sum()
+    # One fused column-wise reduction instead of a pandas .sum() per metric;
+    # nansum skips missing values, as pandas does
+    totals = np.nansum(df[list(_SUM_COLUMNS)].to_numpy(dtype=np.float64), axis=0)
+    total_spend, total_revenue, total_impressions, total_clicks, total_purchases = totals
+    
+    dates = df['date']
+    start, end = dates.min(), dates.max()
     
     return {
-        "total_spend": round(df['spend'].sum(), 2),
-        "total_revenue": round(df['revenue'].sum(), 2),
-        "overall_roas": round(df['revenue'].sum() / df['spend'].sum(), 2),
-        "avg_ctr": round(df['ctr'].mean() * 100, 2),  # Convert to percentage
-        "total_purchases": int(df['purchases'].sum()),
-        "avg_cpc": round(df['spend'].sum() / total_clicks, 3) if total_clicks > 0 else 0,
-        "total_impressions": int(df['impressions'].sum()),
+        "total_spend": round(float(total_spend), 2),
+        "total_revenue": round(float(total_revenue), 2),
+        "overall_roas": round(float(total_revenue / total_spend), 2),
+        "avg_ctr": round(float(np.nanmean(df['ctr'].to_numpy(dtype=np.float64))) * 100, 2),  # Convert to percentage
+        "total_purchases": int(total_purchases),
+        "avg_cpc": round(float(total_spend / total_clicks), 3) if total_clicks > 0 else 0,
+        "total_impressions": int(total_impressions),
         "total_clicks": int(total_clicks),
         "date_range": {
-            "start": df['date'].min().strftime('%Y-%m-%d'),
-            "end": df['date'].max().strftime('%Y-%m-%d'),
-            "days": (df['date'].max() - df['date'].min()).days + 1
+            "start": start.strftime('%Y-%m-%d'),
+            "end": end.strftime('%Y-%m-%d'),
+            "days": (end - start).days + 1
         }
     }
 
@@ -84,20 +287,92 @@ def get_performance_by_dimension(
     Returns:
         Aggregated dataframe
     """
-    agg_df = df.groupby(dimension).agg({
-        'spend': 'sum',
-        'revenue': 'sum',
-        'impressions': 'sum',
-        'clicks': 'sum',
-        'purchases': 'sum'
-    }).assign(
-        roas=lambda x: x['revenue'] / x['spend'],
-        ctr=lambda x: (x['clicks'] / x['impressions']) * 100,  # As percentage
-        cpc=lambda x: x['spend'] / x['clicks']
-    ).round(3)
+    return get_performance_by_dimension_cached(precompute_cube(df, (dimension,)), dimension)
+
+
+def precompute_cube(
+    df: pd.DataFrame,
+    dimensions: Iterable[str] = ('creative_type', 'platform', 'country')
+) -> pd.DataFrame:
+    """Sum the additive metrics over every combination of dimensions at once.
+    
+    One groupby pass over the rows; each per-dimension view is then a
+    cheap re-aggregation of this (much smaller) cube.
+    
+    Args:
+        df: Facebook Ads dataframe
+        dimensions: Columns to group by together
+        
+    Returns:
+        Dataframe of metric sums indexed by the dimension columns
+    """
+    # dropna=False keeps rows whose *other* dimensions are missing, so each
+    # marginal matches a groupby on that dimension alone
+    return df.groupby(
+        list(dimensions), sort=False, dropna=False, observed=True
+    )[list(_SUM_COLUMNS)].sum()
+
+
+def get_performance_by_dimension_cached(cube: pd.DataFrame, dimension: str) -> pd.DataFrame:
+    """Aggregate performance by one dimension from a precomputed cube.
+    
+    Args:
+        cube: Output of precompute_cube covering dimension
+        dimension: Dimension to marginalize onto
+        
+    Returns:
+        Aggregated dataframe, sorted by revenue descending
+    """
+    agg_df = cube.groupby(level=dimension, observed=True).sum()
+    
+    spend = agg_df['spend'].to_numpy(dtype=np.float64)
+    revenue = agg_df['revenue'].to_numpy(dtype=np.float64)
+    clicks = agg_df['clicks'].to_numpy(dtype=np.float64)
+    impressions = agg_df['impressions'].to_numpy(dtype=np.float64)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        agg_df['roas'] = np.divide(revenue, spend)
+        agg_df['ctr'] = np.divide(clicks, impressions) * 100  # As percentage
+        agg_df['cpc'] = np.divide(spend, clicks)
     
     # Sort by revenue descending
-    return agg_df.sort_values('revenue', ascending=False)
+    return agg_df.round(3).sort_values('revenue', ascending=False)
+
+
+def get_date_window_views(
+    df: pd.DataFrame,
+    columns: Iterable[str] = ('ctr', 'roas'),
+    window: int = 7
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Get the earliest and latest rows of metric columns by date.
+    
+    Uses np.argpartition to pull out the window rows with the smallest and
+    largest dates in O(N) instead of sorting the whole frame. Which rows
+    are picked among equal dates is unspecified, and rows inside each
+    window are not ordered.
+    
+    Args:
+        df: Facebook Ads dataframe
+        columns: Metric columns to extract
+        window: Number of rows at each end
+        
+    Returns:
+        Dictionary mapping column name to (earliest rows, latest rows) arrays
+    """
+    dates = df['date'].to_numpy()
+    
+    if len(dates) <= window:
+        idx_low = idx_high = np.arange(len(dates))
+    else:
+        idx_low = np.argpartition(dates, window - 1)[:window]
+        idx_high = np.argpartition(dates, len(dates) - window)[-window:]
+    
+    views = {}
+    for col in columns:
+        values = df[col].to_numpy()
+        views[col] = (values[idx_low], values[idx_high])
+    
+    return views
 
 
 def get_time_series_metrics(df: pd.DataFrame, freq: str = 'D') -> pd.DataFrame:
@@ -110,15 +385,17 @@ def get_time_series_metrics(df: pd.DataFrame, freq: str = 'D') -> pd.DataFrame:
     Returns:
         Time series dataframe
     """
-    df_ts = df.set_index('date').resample(freq).agg({
-        'spend': 'sum',
-        'revenue': 'sum',
-        'impressions': 'sum',
-        'clicks': 'sum',
-        'purchases': 'sum'
-    })
-    
-    df_ts['roas'] = (df_ts['revenue'] / df_ts['spend']).round(2)
-    df_ts['ctr'] = ((df_ts['clicks'] / df_ts['impressions']) * 100).round(3)
+    # Grouping on the column avoids set_index copying the whole frame; the
+    # grouper only re-sorts when dates are not already monotonic, and the
+    # loader leaves them sorted
+    df_ts = df.groupby(pd.Grouper(key='date', freq=freq))[list(_SUM_COLUMNS)].sum()
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df_ts['roas'] = np.divide(
+            df_ts['revenue'].to_numpy(dtype=np.float64), df_ts['spend'].to_numpy(dtype=np.float64)
+        ).round(2)
+        df_ts['ctr'] = (np.divide(
+            df_ts['clicks'].to_numpy(dtype=np.float64), df_ts['impressions'].to_numpy(dtype=np.float64)
+        ) * 100).round(3)
     
     return df_ts
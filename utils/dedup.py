@@ -0,0 +1,45 @@
+"""De-duplication of generated hypotheses before validation."""
+
+from typing import List, Optional, Tuple
+
+from utils.validators import Hypothesis
+
+
+def hypothesis_test_key(hypothesis: Hypothesis) -> Tuple[str, Optional[str], Optional[str]]:
+    """Return the statistical test the evaluator runs for a hypothesis.
+    
+    The evaluator compares one metric between a segment and all other
+    rows, or between the two halves of the date range when no segment is
+    given. Hypotheses with the same key get identical results however
+    their statements are worded.
+    
+    Args:
+        hypothesis: Hypothesis to key
+    
+    Returns:
+        (metric, segment dimension, segment value) tuple
+    """
+    if hypothesis.segment_dimension and hypothesis.segment_value:
+        return hypothesis.metric_to_test, hypothesis.segment_dimension, hypothesis.segment_value
+    
+    return hypothesis.metric_to_test, None, None
+
+
+def dedupe_hypotheses(hypotheses: List[Hypothesis]) -> List[Hypothesis]:
+    """Keep the first hypothesis for each distinct statistical test.
+    
+    Args:
+        hypotheses: Hypotheses in generation order
+    
+    Returns:
+        Hypotheses with repeated tests removed, order preserved
+    """
+    seen = set()
+    unique = []
+    for hypothesis in hypotheses:
+        key = hypothesis_test_key(hypothesis)
+        if key not in seen:
+            seen.add(key)
+            unique.append(hypothesis)
+    
+    return unique
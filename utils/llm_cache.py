@@ -0,0 +1,255 @@
+"""Persistent exact-match and near-duplicate cache for LLM responses."""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9_.%$]+")
+
+# Hashed bag-of-words dimensionality for prompt similarity vectors
+_VECTOR_DIM = 1024
+
+# Words whose presence or absence never changes what is being asked.
+# Question words and time references ("why", "last", "this") do, so they
+# are not listed. Any other differing token (a metric name, number,
+# dimension value...) rules out a near-duplicate match, so "CPC" never
+# answers "CPM".
+_STOPWORDS = frozenset("""
+a an the and or of in on at to for from by with about over during is are
+was were be been did do does please can could me my our us i we you
+""".split())
+
+
+def _tokens(text: str) -> list:
+    """Lowercase word tokens of a prompt."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _content_sequence(tokens: list) -> str:
+    """Non-stopword tokens in order; near-duplicates must match it exactly."""
+    return " ".join(token for token in tokens if token not in _STOPWORDS)
+
+
+def _similarity_vector(tokens: list) -> np.ndarray:
+    """L2-normalized hashed unigram+bigram counts for a token list."""
+    vector = np.zeros(_VECTOR_DIM, dtype=np.float32)
+    features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    for feature in features:
+        digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=4).digest()
+        vector[int.from_bytes(digest, "little") % _VECTOR_DIM] += 1.0
+    
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class LLMCache:
+    """SQLite-backed cache of LLM responses keyed by (agent, prompt) hash.
+    
+    With similarity_threshold set, a second tier answers near-duplicate
+    queries: the rest of the prompt (agent, model, system prompt and the
+    user prompt around the query) must match exactly, the query's
+    non-stopword words must be the same words in the same order, and the
+    queries' hashed bag-of-words cosine similarity must reach the
+    threshold.
+    """
+    
+    def __init__(
+        self,
+        db_path: str = "cache/llm_cache.sqlite",
+        ttl_seconds: int = 86400,
+        similarity_threshold: Optional[float] = None
+    ):
+        """Open (or create) the cache database.
+        
+        Args:
+            db_path: Path to the SQLite file
+            ttl_seconds: Default lifetime of a cached response
+            similarity_threshold: Minimum cosine similarity for a
+                near-duplicate hit (None disables the similarity tier)
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        
+        # One connection shared by all agents; the lock serializes access
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_signatures ("
+            "key TEXT PRIMARY KEY, scope TEXT NOT NULL, content TEXT NOT NULL, vector BLOB NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS query_signatures_lookup ON query_signatures (scope, content)"
+        )
+        self._conn.commit()
+        
+        logger.info("LLM cache opened at %s", db_path)
+    
+    @staticmethod
+    def make_key(
+        system_prompt: str,
+        user_prompt: str,
+        model: str = "",
+        agent_name: str = ""
+    ) -> str:
+        """Hash a normalized prompt pair into a cache key.
+        
+        Line endings and surrounding whitespace are normalized so prompts
+        that differ only in formatting noise share an entry.
+        
+        Args:
+            system_prompt: System instructions
+            user_prompt: User message
+            model: Model name, so different models never share entries
+            agent_name: Calling agent, so agents never share entries
+        
+        Returns:
+            Hex blake2b digest
+        """
+        parts = [
+            agent_name,
+            " ".join(model.split()),
+            system_prompt.replace("\r\n", "\n").strip(),
+            user_prompt.replace("\r\n", "\n").strip()
+        ]
+        return hashlib.blake2b("\x00".join(parts).encode("utf-8"), digest_size=32).hexdigest()
+    
+    @staticmethod
+    def make_scope(
+        system_prompt: str,
+        context: str = "",
+        model: str = "",
+        agent_name: str = ""
+    ) -> str:
+        """Hash everything but the query; similarity hits never cross scopes.
+        
+        Args:
+            system_prompt: System instructions
+            context: User prompt with the query cut out
+            model: Model name
+            agent_name: Calling agent
+        
+        Returns:
+            Hex blake2b digest
+        """
+        return LLMCache.make_key(system_prompt, context, model=model, agent_name=agent_name)
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None if missing/expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            
+            if row is None:
+                return None
+            
+            response, expires_at = row
+            if expires_at < time.time():
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            
+            return response
+    
+    def get_similar(self, scope: str, query: str) -> Optional[str]:
+        """Return the cached response for the closest near-duplicate query.
+        
+        Args:
+            scope: Scope from make_scope
+            query: User query
+        
+        Returns:
+            Cached response text, or None on a miss or when the similarity
+            tier is disabled
+        """
+        if self.similarity_threshold is None:
+            return None
+        
+        tokens = _tokens(query)
+        
+        # Only entries with the same content words in the same order are
+        # candidates; they can differ by stopwords alone
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.vector, r.response FROM query_signatures s "
+                "JOIN responses r ON r.key = s.key "
+                "WHERE s.scope = ? AND s.content = ? AND r.expires_at >= ?",
+                (scope, _content_sequence(tokens), time.time())
+            ).fetchall()
+        
+        if not rows:
+            return None
+        
+        matrix = np.frombuffer(b"".join(v for v, _ in rows), dtype=np.float32)
+        scores = matrix.reshape(len(rows), _VECTOR_DIM) @ _similarity_vector(tokens)
+        best = int(np.argmax(scores))
+        
+        if scores[best] < self.similarity_threshold:
+            return None
+        return rows[best][1]
+    
+    def set(
+        self,
+        key: str,
+        response: str,
+        ttl: Optional[int] = None,
+        scope: Optional[str] = None,
+        query: Optional[str] = None
+    ):
+        """Store a response under key.
+        
+        Args:
+            key: Cache key from make_key
+            response: LLM response text
+            ttl: Lifetime in seconds (defaults to ttl_seconds)
+            scope: Scope from make_scope; with query, also indexes the
+                entry for near-duplicate lookups
+            query: User query the response answers
+        """
+        expires_at = time.time() + (self.ttl_seconds if ttl is None else ttl)
+        
+        signature = None
+        if self.similarity_threshold is not None and scope is not None and query is not None:
+            tokens = _tokens(query)
+            signature = (
+                key, scope, _content_sequence(tokens), _similarity_vector(tokens).tobytes()
+            )
+        
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, expires_at) VALUES (?, ?, ?)",
+                (key, response, expires_at)
+            )
+            if signature is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO query_signatures (key, scope, content, vector) VALUES (?, ?, ?, ?)",
+                    signature
+                )
+            self._conn.commit()
+    
+    def clear(self):
+        """Delete all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM query_signatures")
+            self._conn.commit()
+    
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
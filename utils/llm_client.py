@@ -1,15 +1,154 @@
 """OpenAI API client with retry logic."""
 
+import atexit
+import functools
+import hashlib
+import importlib.util
 import os
+import random
 import time
-from typing import Optional
-from openai import OpenAI, APIError, RateLimitError, APIConnectionError
+from typing import Callable, Optional, TypeVar
+import httpx
+from openai import OpenAI, APIError, RateLimitError, APIConnectionError, DefaultHttpxClient
 from dotenv import load_dotenv
 import logging
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+@functools.lru_cache(maxsize=32)
+def _prompt_cache_key(system_prompt: str) -> str:
+    """Routing key for OpenAI's prompt cache, derived from the system prompt.
+    
+    Requests sharing a key are sent to the same cache shard, so every call
+    from one agent can reuse that agent's cached system-prompt prefix.
+    """
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()[:32]
+
+
+# HTTP/2 lets concurrent agent calls share one connection; httpx only
+# supports it with the optional h2 package (pip install "httpx[http2]")
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Read timeout is per chunk, so long streamed generations are not cut off
+_HTTP_TIMEOUT = httpx.Timeout(120.0, connect=5.0)
+_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_http_client() -> httpx.Client:
+    """Keep-alive connection pool shared by every LLMClient in the process.
+    
+    Clients for different models (e.g. the planner's fast model) reuse the
+    same sockets, so TLS handshakes are paid once per process.
+    """
+    http_client = DefaultHttpxClient(
+        http2=_HTTP2_AVAILABLE,
+        limits=_HTTP_LIMITS,
+        timeout=_HTTP_TIMEOUT
+    )
+    atexit.register(http_client.close)
+    
+    return http_client
+
+
+# Upper bound on any single retry wait, including server-requested ones
+_MAX_RETRY_DELAY = 30.0
+
+
+def _retry_after(error: APIError) -> Optional[float]:
+    """Seconds the server asked us to wait (Retry-After headers), if any."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    
+    headers = response.headers
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        # HTTP-date form; fall back to our own backoff
+        return None
+    
+    return None
+
+
+def _backoff_delay(error: APIError, attempt: int, base_delay: float) -> float:
+    """Delay before the next attempt.
+    
+    Honors the server's Retry-After when present; otherwise exponential
+    backoff with full jitter so concurrent agents do not retry in lockstep.
+    """
+    requested = _retry_after(error)
+    if requested is not None:
+        return min(max(requested, 0.0), _MAX_RETRY_DELAY)
+    
+    return random.uniform(0, min(base_delay * 2 ** attempt, _MAX_RETRY_DELAY))
+
+
+def _is_retryable(error: APIError) -> bool:
+    """Server errors, timeouts and conflicts are retried; other 4xx are not."""
+    status = getattr(error, "status_code", None)
+    return status is None or status >= 500 or status in (408, 409)
+
+
+def _with_retry(call: Callable[[], T], max_retries: int, retry_delay: float) -> T:
+    """Run an API call, retrying transient OpenAI errors.
+    
+    Rate limits, connection errors and retryable API errors (see
+    _is_retryable) are retried with _backoff_delay between attempts; any
+    other exception, including one raised by a streaming callback, is
+    re-raised at once.
+    
+    Args:
+        call: Zero-argument function making one API request
+        max_retries: Maximum attempts
+        retry_delay: Base backoff delay (seconds)
+        
+    Returns:
+        Whatever call returns
+        
+    Raises:
+        APIError: If all retries fail
+    """
+    for attempt in range(max_retries):
+        try:
+            logger.info("Calling OpenAI API (attempt %d/%d)", attempt + 1, max_retries)
+            return call()
+            
+        except RateLimitError as e:
+            if attempt < max_retries - 1:
+                delay = _backoff_delay(e, attempt, retry_delay)
+                logger.warning("Rate limit hit: %s. Retrying in %.1fs...", e, delay)
+                time.sleep(delay)
+            else:
+                raise
+                
+        except APIConnectionError as e:
+            logger.error("Connection error: %s", e)
+            if attempt < max_retries - 1:
+                time.sleep(_backoff_delay(e, attempt, retry_delay))
+            else:
+                raise
+                
+        except APIError as e:
+            logger.error("API error: %s", e)
+            if attempt < max_retries - 1 and _is_retryable(e):
+                time.sleep(_backoff_delay(e, attempt, retry_delay))
+            else:
+                raise
+                
+        except Exception as e:
+            logger.error("Unexpected error: %s", e)
+            raise
+            
+    raise Exception("Max retries exceeded")
+
 
 class LLMClient:
     """Wrapper for OpenAI API with retry and error handling."""
@@ -25,19 +164,25 @@ class LLMClient:
         if not self.api_key:
             raise ValueError("OPENAI_API_KEY not found in environment")
         
-        self.client = OpenAI(api_key=self.api_key)
+        # Parallel agent calls reuse pooled connections (multiplexed over
+        # HTTP/2 when available) instead of opening one per request
+        self.client = OpenAI(api_key=self.api_key, http_client=_shared_http_client())
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
         
-        logger.info(f"Initialized OpenAI client with model: {model}")
+        logger.info(
+            "Initialized OpenAI client with model: %s (HTTP/%s)", model, "2" if _HTTP2_AVAILABLE else "1.1"
+        )
         
     def generate(
         self,
         system_prompt: str,
         user_prompt: str,
         max_retries: int = 3,
-        retry_delay: int = 2
+        retry_delay: int = 2,
+        json_mode: bool = False,
+        on_delta: Optional[Callable[[str], None]] = None
     ) -> str:
         """Generate response from OpenAI with retry logic.
         
@@ -45,7 +190,12 @@ class LLMClient:
             system_prompt: System instructions
             user_prompt: User message
             max_retries: Maximum retry attempts
-            retry_delay: Delay between retries (seconds)
+            retry_delay: Base delay between retries (seconds); doubles per
+                attempt with jitter unless the server sends Retry-After
+            json_mode: Request a JSON object response (response_format)
+            on_delta: If given, stream the response and call this with each
+                text chunk as it arrives; an exception raised by it aborts
+                the request without retrying
             
         Returns:
             Generated text response
@@ -53,52 +203,102 @@ class LLMClient:
         Raises:
             APIError: If all retries fail
         """
-        for attempt in range(max_retries):
-            try:
-                logger.info(f"Calling OpenAI API (attempt {attempt + 1}/{max_retries})")
-                
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ],
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature
-                )
-                
-                response_text = response.choices[0].message.content
-                logger.info(f"API call successful. Response length: {len(response_text)} chars")
-                
-                return response_text
-                
-            except RateLimitError as e:
-                logger.warning(f"Rate limit hit: {e}. Retrying in {retry_delay}s...")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    raise
-                    
-            except APIConnectionError as e:
-                logger.error(f"Connection error: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    raise
-                    
-            except APIError as e:
-                logger.error(f"API error: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    raise
-                    
-            except Exception as e:
-                logger.error(f"Unexpected error: {e}")
-                raise
+        extra_args = {"response_format": {"type": "json_object"}} if json_mode else {}
+        request = dict(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            extra_body={"prompt_cache_key": _prompt_cache_key(system_prompt)},
+            **extra_args
+        )
+        
+        if on_delta is not None:
+            return _with_retry(
+                lambda: self._stream_completion(request, on_delta), max_retries, retry_delay
+            )
+        
+        return _with_retry(lambda: self._complete(request), max_retries, retry_delay)
+    
+    def _complete(self, request: dict) -> str:
+        """Run a non-streaming completion.
+        
+        Args:
+            request: chat.completions.create arguments
+            
+        Returns:
+            Response text
+        """
+        response = self.client.chat.completions.create(**request)
+        
+        response_text = response.choices[0].message.content
+        logger.info("API call successful. Response length: %d chars", len(response_text))
+        self._log_prompt_cache_usage(response)
+        
+        return response_text
+    
+    def _stream_completion(self, request: dict, on_delta: Callable[[str], None]) -> str:
+        """Run a streaming completion, forwarding each text chunk to on_delta.
+        
+        Args:
+            request: chat.completions.create arguments
+            on_delta: Callback for each text chunk
+            
+        Returns:
+            Full response text
+        """
+        parts = []
+        stream = self.client.chat.completions.create(
+            stream=True,
+            stream_options={"include_usage": True},
+            **request
+        )
+        
+        # Closing the stream drops the connection if on_delta aborts
+        with stream:
+            for chunk in stream:
+                if chunk.usage is not None:
+                    self._log_prompt_cache_usage(chunk)
+                if not chunk.choices:
+                    continue
                 
-        raise Exception("Max retries exceeded")
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    parts.append(delta)
+                    on_delta(delta)
+        
+        response_text = "".join(parts)
+        logger.info("Streamed API call successful. Response length: %d chars", len(response_text))
+        
+        return response_text
+    
+    def _log_prompt_cache_usage(self, response):
+        """Log how many prompt tokens were served from the provider's prefix cache.
+        
+        OpenAI caches identical prompt prefixes (1024+ tokens) automatically;
+        cached_tokens shows whether the stable system prompt is being reused.
+        """
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None) or 0
+        logger.info("Prompt tokens: %s (cached: %s)", usage.prompt_tokens, cached_tokens)
+
+
+@functools.lru_cache(maxsize=1)
+def get_default_client() -> LLMClient:
+    """Return the process-wide default LLMClient.
+    
+    Every agent that is not handed a client shares this one, and with it
+    the OpenAI SDK's HTTP connection pool, so TLS handshakes are paid once
+    per process instead of once per client.
+    """
+    return LLMClient()
 
 
 # Alias for backward compatibility
@@ -1,17 +1,29 @@
 """Structured logging utility."""
 
 import logging
-import json
+import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+import orjson
+
+from utils.serialization import dumps_json_line
 
 
 class StructuredLogger:
-    """JSON structured logger for agent system."""
+    """JSON structured logger for agent system.
+    
+    When log_file is set, every event is appended to it as one NDJSON
+    line as soon as it is logged, so the file can be followed live
+    (tail -f) and total log I/O stays linear in the number of events.
+    
+    Large agent inputs are logged as digests unless verbose is set.
+    """
     
-    def __init__(self, log_file: str = None, level: str = "INFO"):
+    def __init__(self, log_file: str = None, level: str = "INFO", verbose: bool = False):
         self.logger = logging.getLogger("agentic_system")
         self.logger.setLevel(getattr(logging, level.upper()))
         
@@ -24,13 +36,15 @@ class StructuredLogger:
         console_handler.setFormatter(console_formatter)
         self.logger.addHandler(console_handler)
         
-        # File handler for JSON logs
+        # Append-only NDJSON event stream
+        self.log_file = log_file
+        self._stream = None
         if log_file:
             Path(log_file).parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.FileHandler(log_file)
-            file_handler.setLevel(logging.DEBUG)
-            self.logger.addHandler(file_handler)
+            self._stream = open(log_file, "ab")
             
+        self.verbose = verbose
+        self._second_prefix = (None, "")
         self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.logs = []
         
@@ -43,7 +57,7 @@ class StructuredLogger:
     ):
         """Log agent execution event."""
         log_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._timestamp(),
             "run_id": self.run_id,
             "agent": agent_name,
             "event_type": event_type,
@@ -53,17 +67,62 @@ class StructuredLogger:
         
         self.logs.append(log_entry)
         
-        # Also log to standard logger
-        self.logger.info(f"[{agent_name}] {event_type}: {status}")
+        if self._stream is not None:
+            self._stream.write(dumps_json_line(log_entry))
+            self._stream.flush()
+        
+        # Also log to standard logger (formatted only if INFO is emitted)
+        self.logger.info("[%s] %s: %s", agent_name, event_type, status)
+        
+    def _timestamp(self) -> str:
+        """Local ISO-8601 timestamp with microseconds.
+        
+        The date/time part is formatted once per second and reused; only
+        the microseconds are filled in per event.
+        """
+        now = time.time()
+        second = int(now)
+        cached_second, prefix = self._second_prefix
+        if second != cached_second:
+            prefix = datetime.fromtimestamp(second).isoformat()
+            self._second_prefix = (second, prefix)
         
+        return f"{prefix}.{int((now - second) * 1_000_000):06d}"
+    
     def save_logs(self, output_path: str):
-        """Save all logs to JSON file."""
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w') as f:
-            json.dump(self.logs, f, indent=2)
+        """Save all logs to an NDJSON file.
+        
+        Events already streamed to output_path are not rewritten; the
+        stream is only flushed and synced to disk.
+        """
+        if self._stream is not None and Path(output_path) == Path(self.log_file):
+            self._stream.flush()
+            os.fsync(self._stream.fileno())
+        else:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(output_path).write_bytes(b"".join(dumps_json_line(entry) for entry in self.logs))
         
-        self.logger.info(f"Logs saved to {output_path}")
+        self.logger.info("Logs saved to %s", output_path)
         
     def get_logs(self) -> list:
         """Return all logged events."""
         return self.logs
+    
+    def close(self):
+        """Close the NDJSON event stream."""
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+    
+    @staticmethod
+    def load_logs(path: str) -> List[Dict[str, Any]]:
+        """Read events back from an NDJSON log file.
+        
+        Args:
+            path: Log file written by a StructuredLogger
+            
+        Returns:
+            Logged events in order
+        """
+        with open(path, "rb") as f:
+            return [orjson.loads(line) for line in f if line.strip()]
@@ -0,0 +1,48 @@
+"""Keyword routing of user queries by how much planning they need."""
+
+import re
+
+# Asking what to do: the planner should shape the recommendations
+_STRATEGIC_RE = re.compile(
+    r"\b(should|recommend\w*|strateg\w*|improve|optimi[sz]e|scale|fix|plan|next steps?)\b",
+    re.IGNORECASE
+)
+
+# Asking for causes, comparisons or changes over time
+_ANALYTICAL_RE = re.compile(
+    r"\b(why|compare\w*|versus|vs|drivers?|caus\w*|trends?|drop\w*|declin\w*|increas\w*|"
+    r"decreas\w*|change\w*|impact|correlat\w*|segment\w*|best|worst|\w*perform\w*)\b",
+    re.IGNORECASE
+)
+
+# Plain metric lookups ("what was total spend last week")
+_LOOKUP_RE = re.compile(
+    r"^\s*(what|how much|how many|show|list|total|give me)\b",
+    re.IGNORECASE
+)
+
+# Longer questions tend to carry more than one ask
+_MAX_TRIVIAL_WORDS = 12
+
+
+def classify_query(query: str) -> str:
+    """Classify a user query as "trivial", "analytical" or "strategic".
+    
+    Only short metric lookups with no analytical or strategic wording are
+    trivial; anything ambiguous is treated as analytical, so the planner
+    still runs for it.
+    
+    Args:
+        query: User's analytical question
+    
+    Returns:
+        "trivial", "analytical" or "strategic"
+    """
+    if _STRATEGIC_RE.search(query):
+        return "strategic"
+    if _ANALYTICAL_RE.search(query):
+        return "analytical"
+    if _LOOKUP_RE.match(query) and len(query.split()) <= _MAX_TRIVIAL_WORDS:
+        return "trivial"
+    
+    return "analytical"
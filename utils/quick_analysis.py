@@ -3,7 +3,9 @@
 import sys
 sys.path.append('.')
 
-from utils.data_processors import load_fb_ads_data, calculate_metrics, get_performance_by_dimension
+from utils.data_processors import (
+    load_fb_ads_data, calculate_metrics, precompute_cube, get_performance_by_dimension_cached
+)
 
 # Load data
 df = load_fb_ads_data()
@@ -22,17 +24,20 @@ metrics = calculate_metrics(df)
 for key, value in metrics.items():
     print(f"{key}: {value}")
 
+# One aggregation pass shared by the three breakdowns below
+cube = precompute_cube(df, ('creative_type', 'platform', 'country'))
+
 print("\n" + "=" * 60)
 print("PERFORMANCE BY CREATIVE TYPE")
 print("=" * 60)
-print(get_performance_by_dimension(df, 'creative_type'))
+print(get_performance_by_dimension_cached(cube, 'creative_type'))
 
 print("\n" + "=" * 60)
 print("PERFORMANCE BY PLATFORM")
 print("=" * 60)
-print(get_performance_by_dimension(df, 'platform'))
+print(get_performance_by_dimension_cached(cube, 'platform'))
 
 print("\n" + "=" * 60)
 print("PERFORMANCE BY COUNTRY")
 print("=" * 60)
-print(get_performance_by_dimension(df, 'country'))
+print(get_performance_by_dimension_cached(cube, 'country'))
@@ -0,0 +1,90 @@
+"""Fast JSON serialization for reports and logs."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict
+
+import orjson
+
+# Pretty-printed like json.dump(indent=2); numpy scalars/arrays and
+# non-string dict keys are handled natively
+_WRITE_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Prompt payloads are compact (indentation only costs tokens) and sort
+# keys so identical data renders identical text
+_PROMPT_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+# Log lines stay compact, one object per line
+_LINE_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize obj to indented JSON bytes.
+    
+    datetimes, enums, dataclasses and numpy values are encoded natively;
+    anything else falls back to str(), as json.dump(default=str) did.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        UTF-8 encoded JSON
+    """
+    return orjson.dumps(obj, default=str, option=_WRITE_OPTIONS)
+
+
+def dumps_prompt_json(obj: Any) -> str:
+    """Serialize obj for embedding in an LLM prompt.
+    
+    Compact, with sorted keys, so the same data always produces the same
+    prompt bytes in as few tokens as possible.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        JSON text
+    """
+    return orjson.dumps(obj, default=str, option=_PROMPT_OPTIONS).decode()
+
+
+def dumps_json_line(obj: Any) -> bytes:
+    """Serialize obj as one compact NDJSON line, newline included.
+    
+    Args:
+        obj: Object to serialize
+        
+    Returns:
+        UTF-8 encoded JSON followed by a newline
+    """
+    return orjson.dumps(obj, default=str, option=_LINE_OPTIONS)
+
+
+def write_json(path: Any, obj: Any):
+    """Serialize obj and write it to path in one call.
+    
+    Args:
+        path: Output file path
+        obj: Object to serialize
+    """
+    Path(path).write_bytes(dumps_json(obj))
+
+
+def write_files(payloads: Dict[Any, bytes]):
+    """Write several pre-serialized files concurrently.
+    
+    File writes release the GIL, so a thread per file overlaps their
+    I/O instead of paying for each one in turn.
+    
+    Args:
+        payloads: Mapping of output path to file contents
+    """
+    if not payloads:
+        return
+    
+    with ThreadPoolExecutor(max_workers=len(payloads)) as executor:
+        # list() re-raises the first write error, if any
+        list(executor.map(
+            lambda item: Path(item[0]).write_bytes(item[1]),
+            payloads.items()
+        ))
@@ -0,0 +1,193 @@
+"""Vectorized statistical kernels for hypothesis validation."""
+
+from typing import Dict
+
+import numpy as np
+
+try:
+    from numba import njit, types
+except ImportError:  # optional: the NumPy path below is used instead
+    njit = None
+
+
+if njit is not None:
+    _MOMENTS = types.Tuple((types.int64[:],) + (types.float64[:],) * 4)
+    _MASKS = types.Array(types.boolean, 2, 'C')
+    
+    # Serial on purpose: the evaluator already runs metric batches on a
+    # thread pool, and Numba's parallel threading layer must not be
+    # launched from several threads at once. The explicit signatures
+    # compile (or load from the on-disk cache) at import, so the first
+    # validation does not pay for JIT compilation. values is typed
+    # read-only: metric columns from the shared data cache are read-only,
+    # and writable arrays convert to that type too.
+    @njit(
+        _MOMENTS(types.Array(types.float64, 1, 'A', readonly=True), _MASKS),
+        cache=True,
+        error_model='numpy'
+    )
+    def _mask_moments(values, masks):
+        """Per-mask n_a, means and squared-deviation sums in fused loops.
+        
+        Unlike the NumPy path this needs no (H, N) temporaries.
+        """
+        n_masks, n_rows = masks.shape
+        total = values.sum()
+        n_a = np.zeros(n_masks, dtype=np.int64)
+        mean_a = np.empty(n_masks)
+        mean_b = np.empty(n_masks)
+        m2_a = np.zeros(n_masks)
+        m2_b = np.zeros(n_masks)
+        
+        for h in range(n_masks):
+            count = 0
+            sum_a = 0.0
+            for j in range(n_rows):
+                if masks[h, j]:
+                    count += 1
+                    sum_a += values[j]
+            n_a[h] = count
+            mean_a[h] = sum_a / count if count > 0 else np.nan
+            mean_b[h] = (total - sum_a) / (n_rows - count) if count < n_rows else np.nan
+            
+            # Second pass over deviations, as in the NumPy path
+            dev_a = 0.0
+            dev_b = 0.0
+            for j in range(n_rows):
+                if masks[h, j]:
+                    dev_a += (values[j] - mean_a[h]) ** 2
+                else:
+                    dev_b += (values[j] - mean_b[h]) ** 2
+            m2_a[h] = dev_a
+            m2_b[h] = dev_b
+        
+        return n_a, mean_a, mean_b, m2_a, m2_b
+else:
+    _mask_moments = None
+
+
+def batch_two_sample_stats(values: np.ndarray, masks: np.ndarray) -> Dict[str, np.ndarray]:
+    """Compare group A against group B for many row masks in one pass.
+    
+    Group A holds the rows where a mask is True and group B the rest.
+    The t-statistic is Student's pooled-variance t (the same one
+    scipy.stats.ttest_ind computes by default). Turning it into a
+    p-value is left to the caller, so this function only needs NumPy.
+    When Numba is installed the per-mask sums run in a compiled kernel.
+    
+    Args:
+        values: Metric column, shape (N,)
+        masks: Boolean group-A membership, shape (H, N)
+    
+    Returns:
+        Per-mask arrays: n_a, n_b, mean_a, mean_b, var_a, var_b (ddof=1),
+        effect_size (Cohen's d), t_stat and dof
+    """
+    values = np.asarray(values, dtype=np.float64)
+    in_a = np.asarray(masks, dtype=bool)
+    n_rows = values.shape[0]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if _mask_moments is not None:
+            n_a, mean_a, mean_b, m2_a, m2_b = _mask_moments(values, np.ascontiguousarray(in_a))
+            n_b = n_rows - n_a
+        else:
+            n_a = in_a.sum(axis=1)
+            n_b = n_rows - n_a
+            sum_a = in_a @ values
+            mean_a = sum_a / n_a
+            mean_b = (values.sum() - sum_a) / n_b
+            
+            # Two-pass variance for numerical stability
+            m2_a = (np.where(in_a, values - mean_a[:, None], 0.0) ** 2).sum(axis=1)
+            m2_b = (np.where(in_a, 0.0, values - mean_b[:, None]) ** 2).sum(axis=1)
+        
+        var_a = m2_a / (n_a - 1)
+        var_b = m2_b / (n_b - 1)
+        
+        dof = n_a + n_b - 2
+        pooled_var = ((n_a - 1) * var_a + (n_b - 1) * var_b) / dof
+        t_stat = (mean_a - mean_b) / np.sqrt(pooled_var * (1 / n_a + 1 / n_b))
+        
+        # Cohen's d on the average of the two group variances
+        pooled_std = np.sqrt((var_a + var_b) / 2)
+        effect_size = np.where(pooled_std > 0, np.abs(mean_a - mean_b) / pooled_std, 0.0)
+    
+    return {
+        "n_a": n_a,
+        "n_b": n_b,
+        "mean_a": mean_a,
+        "mean_b": mean_b,
+        "var_a": var_a,
+        "var_b": var_b,
+        "effect_size": effect_size,
+        "t_stat": t_stat,
+        "dof": dof
+    }
+
+
+def segment_two_sample_stats(values: np.ndarray, codes: np.ndarray, n_segments: int) -> Dict[str, np.ndarray]:
+    """Compare every segment of a dimension against all other rows at once.
+    
+    Equivalent to batch_two_sample_stats with one mask per segment
+    (codes == segment), but works from per-segment count, sum and sum of
+    squares gathered in a single bincount pass, so the cost does not grow
+    with the number of segments tested.
+    
+    Args:
+        values: Metric column, shape (N,)
+        codes: Segment code per row (categorical codes; -1 = missing, which
+            always falls in group B), shape (N,)
+        n_segments: Number of segment codes
+    
+    Returns:
+        Per-segment arrays with the same keys as batch_two_sample_stats,
+        indexed by segment code
+    """
+    values = np.asarray(values, dtype=np.float64)
+    
+    # Rows without a metric value are left out, as pandas' skipna would;
+    # otherwise one NaN spoils the totals behind every segment
+    ok = np.isfinite(values)
+    values = values[ok]
+    n_rows = values.shape[0]
+    
+    # Centering on the overall mean keeps the sum-of-squares form stable
+    offset = values.mean() if n_rows else 0.0
+    centered = values - offset
+    slots = np.asarray(codes)[ok] + 1  # slot 0 collects missing codes
+    
+    counts = np.bincount(slots, minlength=n_segments + 1)[1:]
+    sums = np.bincount(slots, weights=centered, minlength=n_segments + 1)[1:]
+    squares = np.bincount(slots, weights=centered ** 2, minlength=n_segments + 1)[1:]
+    total_sum = centered.sum()
+    total_squares = (centered ** 2).sum()
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        n_a = counts
+        n_b = n_rows - n_a
+        mean_a = sums / n_a
+        mean_b = (total_sum - sums) / n_b
+        var_a = (squares - n_a * mean_a ** 2) / (n_a - 1)
+        var_b = ((total_squares - squares) - n_b * mean_b ** 2) / (n_b - 1)
+        
+        dof = n_a + n_b - 2
+        pooled_var = ((n_a - 1) * var_a + (n_b - 1) * var_b) / dof
+        t_stat = (mean_a - mean_b) / np.sqrt(pooled_var * (1 / n_a + 1 / n_b))
+        
+        pooled_std = np.sqrt((var_a + var_b) / 2)
+        # Zero spread means no effect; undefined spread stays NaN
+        effect_size = np.where(pooled_std == 0, 0.0, np.abs(mean_a - mean_b) / pooled_std)
+    
+    return {
+        "n_a": n_a,
+        "n_b": n_b,
+        # Undo the centering for the reported means
+        "mean_a": mean_a + offset,
+        "mean_b": mean_b + offset,
+        "var_a": var_a,
+        "var_b": var_b,
+        "effect_size": effect_size,
+        "t_stat": t_stat,
+        "dof": dof
+    }
@@ -1,9 +1,11 @@
 """Pydantic schemas for agent communication and data validation."""
 
-from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional, Dict, Any, Literal
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import List, Optional, Dict, Any, Literal, Type, Union, get_args, get_origin
 from datetime import datetime
 from enum import Enum
+import functools
+import sys
 
 
 # ============================================================
@@ -50,6 +52,8 @@ class Task(BaseModel):
     dependencies: List[str] = Field(default_factory=list, description="Task IDs that must complete first")
     status: Literal["pending", "in_progress", "completed", "failed"] = "pending"
     output: Optional[Any] = None
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class TaskPlan(BaseModel):
@@ -58,6 +62,8 @@ class TaskPlan(BaseModel):
     tasks: List[Task] = Field(..., description="Ordered list of tasks")
     reasoning: str = Field(..., description="Why this plan was chosen")
     expected_insights: List[str] = Field(..., description="Expected types of insights")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 # ============================================================
@@ -84,8 +90,7 @@ class Hypothesis(BaseModel):
     confidence: ConfidenceLevel = Field(..., description="Initial confidence level")
     supporting_evidence: List[str] = Field(default_factory=list)
     
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
 
 
 class ValidationResult(BaseModel):
@@ -107,8 +112,7 @@ class ValidationResult(BaseModel):
     verdict: str = Field(..., description="Clear explanation of validation result")
     actionability: str = Field(..., description="What action to take based on this")
     
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
     
     @field_validator('confidence_score')
     @classmethod
@@ -144,6 +148,13 @@ class Insight(BaseModel):
         ..., description="Date range analyzed"
     )
     affected_campaigns: List[str] = Field(default_factory=list)
+    
+    model_config = ConfigDict(frozen=True)
+    
+    @functools.cached_property
+    def dumped(self) -> Dict[str, Any]:
+        """model_dump() of this insight, computed once and shared (read-only)."""
+        return self.model_dump()
 
 
 # ============================================================
@@ -182,8 +193,7 @@ class CreativeRecommendation(BaseModel):
         description="Ad IDs or creative examples that performed well"
     )
     
-    class Config:
-        use_enum_values = True
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
 
 
 class CreativeAnalysis(BaseModel):
@@ -203,6 +213,8 @@ class CreativeAnalysis(BaseModel):
     
     # Summary metrics
     overall_creative_performance: Dict[str, float] = Field(default_factory=dict)
+    
+    model_config = ConfigDict(frozen=True)
 
 
 # ============================================================
@@ -230,6 +242,13 @@ class DataSummary(BaseModel):
     
     # Anomalies detected
     anomalies: List[str] = Field(default_factory=list)
+    
+    model_config = ConfigDict(frozen=True)
+    
+    @functools.cached_property
+    def dumped(self) -> Dict[str, Any]:
+        """model_dump() of this summary, computed once and shared (read-only)."""
+        return self.model_dump()
 
 
 class InsightAgentOutput(BaseModel):
@@ -238,6 +257,23 @@ class InsightAgentOutput(BaseModel):
     data_summary_used: DataSummary
     reasoning: str = Field(..., description="Overall reasoning process")
     confidence_in_hypotheses: float = Field(..., ge=0.0, le=1.0)
+    
+    model_config = ConfigDict(frozen=True)
+
+
+class PlannerResponse(BaseModel):
+    """Raw JSON response expected from the Planner Agent's LLM call."""
+    query: str
+    tasks: List[Task]
+    reasoning: str
+    expected_insights: List[str] = Field(default_factory=list)
+
+
+class InsightResponse(BaseModel):
+    """Raw JSON response expected from the Insight Agent's LLM call."""
+    hypotheses_generated: List[Hypothesis]
+    reasoning: str
+    confidence_in_hypotheses: float = Field(0.7, ge=0.0, le=1.0)
 
 
 class EvaluatorOutput(BaseModel):
@@ -250,6 +286,8 @@ class EvaluatorOutput(BaseModel):
     needs_replan: bool = False
     replan_reason: Optional[str] = None
     suggested_focus_areas: List[str] = Field(default_factory=list)
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class FinalReport(BaseModel):
@@ -273,3 +311,161 @@ class FinalReport(BaseModel):
     total_hypotheses_tested: int
     validation_success_rate: float
     total_iterations: int = 1
+    
+    model_config = ConfigDict(frozen=True)
+
+
+# ============================================================
+# FAST CONSTRUCTION FOR PARSED LLM OUTPUT
+# ============================================================
+
+def _value_has_type(value: Any, annotation: Any) -> bool:
+    """Cheap structural check of a value against a field annotation.
+    
+    Returns False for anything it does not know how to check, so the
+    caller falls back to full validation.
+    """
+    if annotation is Any:
+        return True
+    
+    origin = get_origin(annotation)
+    if origin is Literal:
+        return value in get_args(annotation)
+    if origin is Union:
+        return any(_value_has_type(value, arg) for arg in get_args(annotation))
+    if origin is list:
+        (item_type,) = get_args(annotation) or (Any,)
+        return isinstance(value, list) and all(_value_has_type(v, item_type) for v in value)
+    if origin is dict:
+        return isinstance(value, dict) and annotation == Dict[str, Any]
+    
+    if annotation is type(None):
+        return value is None
+    if isinstance(annotation, type):
+        if issubclass(annotation, Enum):
+            return isinstance(value, annotation) or value in annotation._value2member_map_
+        if annotation is float:
+            return isinstance(value, (int, float)) and not isinstance(value, bool)
+        if annotation in (str, int, bool) or issubclass(annotation, BaseModel):
+            return type(value) is annotation or (annotation is not bool and isinstance(value, annotation))
+    
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def _shape_spec(model_cls: Type[BaseModel]) -> Optional[tuple]:
+    """Per-field (name, required, annotation, ge, le) checks for model_cls.
+    
+    Resolved once per class. None means the model has custom validators
+    and must always be fully validated.
+    """
+    decorators = model_cls.__pydantic_decorators__
+    if decorators.field_validators or decorators.model_validators:
+        return None
+    
+    spec = []
+    for name, field in model_cls.model_fields.items():
+        # Numeric bounds declared with Field(ge=..., le=...)
+        ge = le = None
+        for constraint in field.metadata:
+            ge = getattr(constraint, 'ge', ge)
+            le = getattr(constraint, 'le', le)
+        spec.append((sys.intern(name), field.is_required(), field.annotation, ge, le))
+    
+    return tuple(spec)
+
+
+def _matches_spec(spec: tuple, data: Dict[str, Any]) -> bool:
+    """Check that data already satisfies every field check in spec."""
+    for name, required, annotation, ge, le in spec:
+        if name not in data:
+            if required:
+                return False
+            continue
+        
+        value = data[name]
+        if not _value_has_type(value, annotation):
+            return False
+        if (ge is not None and value < ge) or (le is not None and value > le):
+            return False
+    
+    return True
+
+
+def _has_model_shape(model_cls: Type[BaseModel], data: Dict[str, Any]) -> bool:
+    """Check that data already matches model_cls field by field."""
+    spec = _shape_spec(model_cls)
+    return spec is not None and _matches_spec(spec, data)
+
+
+def construct_trusted(
+    model_cls: Type[BaseModel],
+    data: Dict[str, Any],
+    strict: bool = False
+) -> BaseModel:
+    """Build a model from parsed LLM output, skipping validation when safe.
+    
+    If data already has the schema's shape (required keys, allowed literal
+    and enum values, basic types, numeric bounds), the model is created
+    with model_construct. Anything else, or strict=True, goes through
+    normal validation so errors are still reported as ValidationError.
+    
+    Args:
+        model_cls: Pydantic model class
+        data: Field values
+        strict: Always run full validation
+        
+    Returns:
+        Model instance
+    """
+    if not strict and isinstance(data, dict) and _has_model_shape(model_cls, data):
+        return model_cls.model_construct(**data)
+    
+    return model_cls(**data)
+
+
+def construct_trusted_many(
+    model_cls: Type[BaseModel],
+    items: List[Dict[str, Any]],
+    strict: bool = False
+) -> List[BaseModel]:
+    """Build a list of models from parsed LLM output.
+    
+    Same rules as construct_trusted, but the schema checks are resolved
+    once for the whole list instead of once per item, and items that do
+    need validation are validated together in one pydantic-core call.
+    
+    Args:
+        model_cls: Pydantic model class
+        items: Field values for each instance
+        strict: Always run full validation
+        
+    Returns:
+        Model instances, in order
+    """
+    spec = None if strict else _shape_spec(model_cls)
+    if spec is None:
+        return _list_adapter(model_cls).validate_python(items)
+    
+    construct = model_cls.model_construct
+    models = []
+    pending = []
+    for i, data in enumerate(items):
+        if isinstance(data, dict) and _matches_spec(spec, data):
+            models.append(construct(**data))
+        else:
+            models.append(None)
+            pending.append(i)
+    
+    if pending:
+        validated = _list_adapter(model_cls).validate_python([items[i] for i in pending])
+        for i, model in zip(pending, validated):
+            models[i] = model
+    
+    return models
+
+
+@functools.lru_cache(maxsize=None)
+def _list_adapter(model_cls: Type[BaseModel]) -> TypeAdapter:
+    """List[model_cls] validator, compiled once per class."""
+    return TypeAdapter(List[model_cls])
@@ -1,20 +1,31 @@
 """Main orchestrator that manages agent execution flow."""
 
 from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+import heapq
+import itertools
 import logging
 
-from agents.planner_agent import PlannerAgent
+from agents.planner_agent import PlannerAgent, standard_task_plan
 from agents.data_agent import DataAgent
 from agents.insight_agent import InsightAgent
 from agents.evaluator_agent import EvaluatorAgent
 from agents.creative_generator import CreativeGeneratorAgent
 from utils.validators import TaskPlan, DataSummary, FinalReport
-from utils.llm_client import LLMClient as ClaudeClient
+from utils.dedup import dedupe_hypotheses
+from utils.query_classifier import classify_query
+from utils.llm_client import LLMClient as ClaudeClient, get_default_client
+from utils.llm_cache import LLMCache
 from utils.logger import StructuredLogger
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Suffix keeping report ids unique when several reports finish in the
+# same second (next() on a count is atomic under the GIL)
+_report_sequence = itertools.count(1)
+
 
 class AgenticOrchestrator:
     """Orchestrator that manages the multi-agent workflow."""
@@ -23,7 +34,10 @@ class AgenticOrchestrator:
         self,
         llm_client: Optional[ClaudeClient] = None,
         structured_logger: Optional[StructuredLogger] = None,
-        max_replans: int = 2
+        max_replans: int = 2,
+        llm_cache: Optional[LLMCache] = None,
+        strict_validation: bool = False,
+        fast_llm_client: Optional[ClaudeClient] = None
     ):
         """Initialize orchestrator.
         
@@ -31,31 +45,48 @@ class AgenticOrchestrator:
             llm_client: Shared Claude client
             structured_logger: Shared logger
             max_replans: Maximum replanning iterations
+            llm_cache: Shared LLM response cache (None disables caching)
+            strict_validation: Fully validate all parsed LLM output
+            fast_llm_client: Cheaper client for the planner, whose task plan
+                is only reported (defaults to llm_client)
         """
-        self.llm_client = llm_client or ClaudeClient()
+        self.llm_client = llm_client or get_default_client()
+        self.fast_llm_client = fast_llm_client or self.llm_client
         self.structured_logger = structured_logger or StructuredLogger()
         self.max_replans = max_replans
+        self.llm_cache = llm_cache
+        self.strict_validation = strict_validation
         
         # Initialize all agents
         self.planner = PlannerAgent(
-            llm_client=self.llm_client,
-            structured_logger=self.structured_logger
+            llm_client=self.fast_llm_client,
+            structured_logger=self.structured_logger,
+            llm_cache=self.llm_cache,
+            strict_validation=self.strict_validation
         )
         self.data_agent = DataAgent(
             llm_client=self.llm_client,
-            structured_logger=self.structured_logger
+            structured_logger=self.structured_logger,
+            llm_cache=self.llm_cache,
+            strict_validation=self.strict_validation
         )
         self.insight_agent = InsightAgent(
             llm_client=self.llm_client,
-            structured_logger=self.structured_logger
+            structured_logger=self.structured_logger,
+            llm_cache=self.llm_cache,
+            strict_validation=self.strict_validation
         )
         self.evaluator = EvaluatorAgent(
             llm_client=self.llm_client,
-            structured_logger=self.structured_logger
+            structured_logger=self.structured_logger,
+            llm_cache=self.llm_cache,
+            strict_validation=self.strict_validation
         )
         self.creative_generator = CreativeGeneratorAgent(
             llm_client=self.llm_client,
-            structured_logger=self.structured_logger
+            structured_logger=self.structured_logger,
+            llm_cache=self.llm_cache,
+            strict_validation=self.strict_validation
         )
         
         logger.info("Orchestrator initialized with all agents")
@@ -74,83 +105,141 @@ class AgenticOrchestrator:
         Returns:
             FinalReport with all insights and recommendations
         """
-        logger.info(f"Starting workflow for query: {query}")
+        logger.info("Starting workflow for query: %s", query)
         
         iteration = 0
         
-        while iteration <= self.max_replans:
-            iteration += 1
-            logger.info(f"=== Iteration {iteration} ===")
-            
-            # Step 1: Data Agent - Always load data first
-            logger.info("Step 1: Loading and summarizing data...")
-            data_summary = self.data_agent.execute(data_file_path=data_file_path)
-            
-            # Step 2: Planner - Create task plan
-            logger.info("Step 2: Creating task plan...")
-            data_context = {
-                'start_date': data_summary.date_range['start'],
-                'end_date': data_summary.date_range['end'],
-                'total_spend': data_summary.total_spend,
-                'overall_roas': data_summary.overall_roas
-            }
-            
-            task_plan = self.planner.execute(
-                query=query,
-                data_context=data_context
-            )
-            
-            logger.info(f"Plan created with {len(task_plan.tasks)} tasks")
-            
-            # Step 3: Insight Agent - Generate hypotheses
-            logger.info("Step 3: Generating hypotheses...")
-            insight_output = self.insight_agent.execute(
-                query=query,
-                data_summary=data_summary
-            )
-            
-            logger.info(f"Generated {len(insight_output.hypotheses_generated)} hypotheses")
-            
-            # Step 4: Evaluator - Validate hypotheses
-            logger.info("Step 4: Validating hypotheses...")
-            evaluator_output = self.evaluator.execute(
-                hypotheses=insight_output.hypotheses_generated,
-                data_file_path=data_file_path
-            )
-            
-            logger.info(f"Validated {len(evaluator_output.validated_insights)} insights")
-            
-            # Check if replanning needed
-            if evaluator_output.needs_replan and iteration < self.max_replans:
-                logger.warning(f"Replanning needed: {evaluator_output.replan_reason}")
-                continue
-            
-            # Step 5: Creative Generator - Generate recommendations
-            logger.info("Step 5: Generating creative recommendations...")
-            creative_analysis = self.creative_generator.execute(
-                validated_insights=evaluator_output.validated_insights,
-                data_file_path=data_file_path
-            )
-            
-            logger.info(f"Generated {len(creative_analysis.recommendations)} recommendations")
+        # Step 1: Data Agent - Load data first; the file does not change
+        # between replans, so the summary is computed once for all iterations
+        logger.info("Step 1: Loading and summarizing data...")
+        data_summary = self.data_agent.execute(data_file_path=data_file_path)
+        
+        data_context = {
+            'start_date': data_summary.date_range['start'],
+            'end_date': data_summary.date_range['end'],
+            'total_spend': data_summary.total_spend,
+            'overall_roas': data_summary.overall_roas
+        }
+        
+        # The planner's output is only reported, nothing downstream waits on
+        # it, and its inputs do not change between replans: plan once, in
+        # the background, while the other stages run
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # Step 2: Planner - Create task plan (overlaps steps 3-5); simple
+            # lookups get the standard plan without an LLM call
+            if classify_query(query) == "trivial":
+                logger.info("Step 2: Simple query, using the standard task plan")
+                plan_future = None
+            else:
+                logger.info("Step 2: Creating task plan...")
+                plan_future = executor.submit(
+                    self.planner.execute,
+                    query=query,
+                    data_context=data_context
+                )
             
-            # Create final report
-            report = self._create_final_report(
-                query=query,
-                data_summary=data_summary,
-                validated_insights=evaluator_output.validated_insights,
-                creative_analysis=creative_analysis,
-                total_iterations=iteration,
-                validation_results=evaluator_output.validation_results
-            )
+            # Replans only regenerate and re-test hypotheses, steered by the
+            # evaluator's feedback on the previous attempts
+            focus_dimension = "all dimensions"
+            feedback = None
+            failed_statements = []
             
-            logger.info("Workflow completed successfully")
-            return report
+            while iteration <= self.max_replans:
+                iteration += 1
+                logger.info("=== Iteration %d ===", iteration)
+                
+                # Step 3: Insight Agent - Generate hypotheses
+                logger.info("Step 3: Generating hypotheses...")
+                insight_output = self.insight_agent.execute(
+                    query=query,
+                    data_summary=data_summary,
+                    focus_dimension=focus_dimension,
+                    feedback=feedback
+                )
+                
+                logger.info("Generated %d hypotheses", len(insight_output.hypotheses_generated))
+                
+                # Reworded hypotheses that run the same test add no evidence
+                hypotheses = dedupe_hypotheses(insight_output.hypotheses_generated)
+                skipped = len(insight_output.hypotheses_generated) - len(hypotheses)
+                if skipped:
+                    logger.info("Skipping %d duplicate hypotheses", skipped)
+                
+                # Step 4: Evaluator - Validate hypotheses
+                logger.info("Step 4: Validating hypotheses...")
+                evaluator_output = self.evaluator.execute(
+                    hypotheses=hypotheses,
+                    data_file_path=data_file_path
+                )
+                
+                logger.info("Validated %d insights", len(evaluator_output.validated_insights))
+                
+                # Check if replanning needed
+                if evaluator_output.needs_replan and iteration < self.max_replans:
+                    logger.warning("Replanning needed: %s", evaluator_output.replan_reason)
+                    if evaluator_output.suggested_focus_areas:
+                        focus_dimension = "; ".join(evaluator_output.suggested_focus_areas)
+                    # Always changes the prompt, so a replan is never answered
+                    # with the previous attempt's cached response
+                    failed_statements += self._failed_statements(hypotheses, evaluator_output)
+                    feedback = self._replan_feedback(evaluator_output, failed_statements)
+                    continue
+                
+                # Step 5: Creative Generator - Generate recommendations
+                logger.info("Step 5: Generating creative recommendations...")
+                creative_analysis = self.creative_generator.execute(
+                    validated_insights=evaluator_output.validated_insights,
+                    data_file_path=data_file_path
+                )
+                
+                logger.info("Generated %d recommendations", len(creative_analysis.recommendations))
+                
+                task_plan = plan_future.result() if plan_future is not None else standard_task_plan(query)
+                logger.info("Plan created with %d tasks", len(task_plan.tasks))
+                
+                # Create final report
+                report = self._create_final_report(
+                    query=query,
+                    data_summary=data_summary,
+                    validated_insights=evaluator_output.validated_insights,
+                    creative_analysis=creative_analysis,
+                    total_iterations=iteration,
+                    validation_results=evaluator_output.validation_results
+                )
+                
+                logger.info("Workflow completed successfully")
+                return report
         
         # If we exhausted all replans
         logger.error("Max replanning iterations reached")
         raise RuntimeError("Failed to generate satisfactory insights after max replans")
     
+    @staticmethod
+    def _failed_statements(hypotheses: list, evaluator_output) -> list:
+        """Statements of the hypotheses that were not validated."""
+        validated_ids = {
+            result.hypothesis_id for result in evaluator_output.validation_results
+            if result.status == "validated"
+        }
+        return [h.statement for h in hypotheses if h.hypothesis_id not in validated_ids]
+    
+    @staticmethod
+    def _replan_feedback(evaluator_output, failed_statements: list) -> str:
+        """Tell the insight agent why it is replanning and what already failed.
+        
+        Args:
+            evaluator_output: Evaluator output that triggered the replan
+            failed_statements: Unvalidated hypotheses from all attempts so far
+            
+        Returns:
+            Feedback text for the insight prompt
+        """
+        tested = "; ".join(failed_statements) or "none"
+        return (
+            f"{evaluator_output.replan_reason} "
+            f"Already tested without validation (propose different hypotheses): {tested}"
+        )
+    
     def _create_final_report(
         self,
         query: str,
@@ -176,17 +265,22 @@ class AgenticOrchestrator:
         # Generate executive summary
         exec_summary = self._generate_executive_summary(
             validated_insights,
-            creative_analysis
+            creative_analysis,
+            data_summary
         )
         
-        # Calculate validation success rate
+        # Calculate validation success rate; the evaluator creates exactly
+        # one insight per validated result, so no per-result scan is needed
         total_hypotheses = len(validation_results)
-        validated_count = sum(1 for r in validation_results if r.status == "validated")
+        validated_count = len(validated_insights)
         success_rate = validated_count / total_hypotheses if total_hypotheses > 0 else 0
         
+        # One timestamp for both fields, so the id matches generated_at
+        now = datetime.now()
+        
         return FinalReport(
-            report_id=f"report_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            generated_at=datetime.now(),
+            report_id=f"report_{now.strftime('%Y%m%d_%H%M%S')}_{next(_report_sequence)}",
+            generated_at=now,
             original_query=query,
             analysis_period=data_summary.date_range,
             executive_summary=exec_summary,
@@ -201,13 +295,18 @@ class AgenticOrchestrator:
     def _generate_executive_summary(
         self,
         insights: list,
-        creative_analysis
+        creative_analysis,
+        data_summary: Optional[DataSummary] = None
     ) -> str:
         """Generate executive summary.
         
+        Deterministic templating over the already-validated outputs; no
+        LLM call is made here.
+        
         Args:
             insights: Validated insights
             creative_analysis: Creative analysis
+            data_summary: Data summary for the headline metrics
             
         Returns:
             Executive summary text
@@ -215,16 +314,29 @@ class AgenticOrchestrator:
         if not insights:
             return "No significant insights found in the analysis."
         
-        top_insight = max(insights, key=lambda x: x.impact_score)
+        top_insights = heapq.nlargest(3, insights, key=attrgetter("impact_score"))
         top_rec = max(
             creative_analysis.recommendations,
-            key=lambda x: x.priority_score
+            key=attrgetter("priority_score")
         ) if creative_analysis.recommendations else None
         
-        summary = f"Analysis identified {len(insights)} key insights. "
-        summary += f"Top finding: {top_insight.title}. "
+        if data_summary is not None:
+            summary = (
+                f"Across ${data_summary.total_spend:,.2f} of spend "
+                f"(overall ROAS {data_summary.overall_roas:.2f}), "
+                f"analysis identified {len(insights)} key insights. "
+            )
+        else:
+            summary = f"Analysis identified {len(insights)} key insights. "
+        summary += f"Top finding: {top_insights[0].title}. "
+        
+        if len(top_insights) > 1:
+            others = "; ".join(
+                f"{insight.title} (impact {insight.impact_score}/10)" for insight in top_insights[1:]
+            )
+            summary += f"Also notable: {others}. "
         
         if top_rec:
             summary += f"Primary recommendation: {top_rec.action}."
         
-        return summary
+        return summary.rstrip()